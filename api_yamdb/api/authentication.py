@@ -0,0 +1,134 @@
+"""JWT-аутентификация с кэшем пользователей и ролью из токена."""
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from api.tokens import ROLE_CLAIM, VERSION_CLAIM, get_token_version
+from reviews.models import User
+
+
+class UserCache:
+    """
+    Пользователи по id: не больше AUTH_USER_CACHE_SIZE записей,
+    каждая живёт AUTH_USER_CACHE_TIMEOUT секунд.
+
+    Кэш у каждого процесса свой; запись пользователя в этом процессе
+    сбрасывает его сигналом, в остальных — по истечении времени жизни.
+    id из токена и pk модели приводятся к строке.
+    """
+
+    def __init__(self):
+        self.users = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= monotonic():
+                del self.users[user_id]
+                return None
+            self.users.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        user_id = str(user_id)
+        with self.lock:
+            self.users[user_id] = (
+                user, monotonic() + settings.AUTH_USER_CACHE_TIMEOUT
+            )
+            self.users.move_to_end(user_id)
+            while len(self.users) > settings.AUTH_USER_CACHE_SIZE:
+                self.users.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.users.pop(str(user_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
+
+
+def get_cached_user(user_id, load):
+    """Копия пользователя из user_cache; при промахе — load()."""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = load()
+        user_cache.set(user_id, user)
+    return copy(user)
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Пользователь из claims токена, без обращения к базе.
+
+    Для записи связей модель пользователя доступна в instance
+    и читается лениво через user_cache.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+    @cached_property
+    def instance(self):
+        return get_cached_user(
+            self.pk, lambda: User.objects.get(pk=self.pk)
+        )
+
+
+def get_user_instance(user):
+    """Модель пользователя запроса для записи связей и фильтров."""
+    if isinstance(user, RoleTokenUser):
+        return user.instance
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication без чтения пользователя на каждый запрос.
+
+    Токен с ролью даёт RoleTokenUser, если его версия совпадает
+    с текущей версией токенов пользователя. Для токенов без роли
+    пользователь берётся из user_cache: туда попадают только
+    найденные активные пользователи, каждый запрос получает копию.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return get_cached_user(
+                validated_token.get(api_settings.USER_ID_CLAIM),
+                lambda: super(CachedJWTAuthentication, self).get_user(
+                    validated_token
+                )
+            )
+        user = RoleTokenUser(validated_token)
+        version = get_token_version(user.pk)
+        if version is None or version != validated_token.get(VERSION_CLAIM):
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked'
+            )
+        return user
@@ -0,0 +1,43 @@
+"""Кэш ответов списков с инвалидацией при записи."""
+from hashlib import md5
+from uuid import uuid4
+
+from django.core.cache import cache
+
+VERSION_KEY = 'list-cache-version:{label}'
+RESPONSE_KEY = 'list-cache:{label}:{version}:{request}'
+
+
+def get_list_cache_version(model):
+    """
+    Текущая версия кэша списков модели.
+
+    Версия — случайная строка: после вытеснения ключа версии из
+    кэша старые ответы не могут снова стать актуальными.
+    """
+    key = VERSION_KEY.format(label=model._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def get_list_cache_key(model, request):
+    """Ключ ответа: версия модели, полный URL и формат ответа."""
+    request_key = md5(
+        f'{request.build_absolute_uri()}:{request.accepted_media_type}'
+        .encode()
+    ).hexdigest()
+    return RESPONSE_KEY.format(
+        label=model._meta.label_lower,
+        version=get_list_cache_version(model),
+        request=request_key
+    )
+
+
+def invalidate_list_cache(model):
+    """Сброс всех закэшированных списков модели."""
+    cache.set(
+        VERSION_KEY.format(label=model._meta.label_lower), uuid4().hex, None
+    )
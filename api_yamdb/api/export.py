@@ -0,0 +1,42 @@
+"""Потоковая выгрузка каталога в NDJSON."""
+from collections import defaultdict
+from itertools import islice
+
+from api import fast_path
+from api.renderers import FastJSONRenderer
+from reviews.models import Review, Title
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def export_titles(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Произведения с жанрами, категорией и отзывами по одному на строку.
+
+    Произведения читаются через iterator(chunk_size), жанры и отзывы
+    каждой пачки — двумя запросами, поэтому память не растёт
+    с размером каталога.
+    """
+    renderer = FastJSONRenderer()
+    rows = Title.objects.filter(
+        deletion_pending=False
+    ).with_rating().order_by('pk').values(
+        *fast_path.TITLE_VALUES
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        reviews = defaultdict(list)
+        review_rows = list(Review.objects.filter(
+            title_id__in=[row['id'] for row in chunk]
+        ).order_by('title_id', 'pub_date', 'pk').values(
+            'title_id', *fast_path.REVIEW_VALUES
+        ))
+        for row, review in zip(
+            review_rows, fast_path.review_data(review_rows)
+        ):
+            reviews[row['title_id']].append(review)
+        for title in fast_path.title_data(chunk):
+            title['reviews'] = reviews[title['id']]
+            yield renderer.render(title) + b'\n'
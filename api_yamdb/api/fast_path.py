@@ -0,0 +1,74 @@
+"""
+Сборка ответов списков без сериализаторов.
+
+Функции принимают страницу строк из values() и возвращают те же
+словари, что и соответствующие сериализаторы из api.serializers.
+"""
+from collections import defaultdict
+
+from rest_framework.fields import DateTimeField
+
+from reviews.models import GenreTitle
+
+CATEGORY_GENRE_VALUES = ('name', 'slug')
+TITLE_VALUES = (
+    'id', 'name', 'year', 'rating', 'description',
+    'category_id', 'category__name', 'category__slug',
+    'category__deletion_pending'
+)
+REVIEW_VALUES = ('id', 'text', 'author__username', 'score', 'pub_date')
+
+datetime_field = DateTimeField()
+
+
+def category_genre_data(rows):
+    """Данные как у CategorySerializer и GenreSerializer."""
+    return [{'name': row['name'], 'slug': row['slug']} for row in rows]
+
+
+def title_data(rows):
+    """
+    Данные как у TitleReadSerializer.
+
+    Жанры страницы читаются одним запросом и группируются за один
+    проход в порядке сортировки модели Genre.
+    """
+    genres = defaultdict(list)
+    for title_id, name, slug in GenreTitle.objects.filter(
+        title_id__in=[row['id'] for row in rows]
+    ).order_by('genre__slug').values_list(
+        'title_id', 'genre__name', 'genre__slug'
+    ):
+        genres[title_id].append({'name': name, 'slug': slug})
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'rating': None if row['rating'] is None else int(row['rating']),
+            'description': row['description'],
+            'genre': genres[row['id']],
+            'category': None if (
+                row['category_id'] is None
+                or row['category__deletion_pending']
+            ) else {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            },
+        }
+        for row in rows
+    ]
+
+
+def review_data(rows):
+    """Данные как у ReviewSerializer."""
+    return [
+        {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': datetime_field.to_representation(row['pub_date']),
+        }
+        for row in rows
+    ]
@@ -1,15 +1,45 @@
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку значений через запятую."""
 
 
 class TitlesFilter(filters.FilterSet):
-    """Фильтр произведений."""
-    category = filters.CharFilter(
-        field_name='category__slug', lookup_expr='contains')
-    genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='contains')
+    """
+    Фильтр произведений.
+
+    Слаги сравниваются точно, поэтому используют уникальные индексы.
+    genre=a,b — произведения хотя бы одного из жанров,
+    genre_all=a,b — произведения всех перечисленных жанров,
+    category=a,b — произведения любой из категорий, кроме ожидающих
+    удаления.
+    """
+    category = CharInFilter(method='filter_category')
+    genre = CharInFilter(method='filter_genre')
+    genre_all = CharInFilter(method='filter_genre_all')
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'name', 'year']
+        fields = ['category', 'genre', 'genre_all', 'name', 'year']
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(
+            category__slug__in=value, category__deletion_pending=False
+        )
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug__in=value
+        ).values('title'))
+
+    def filter_genre_all(self, queryset, name, value):
+        slugs = set(value)
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug__in=slugs
+        ).values('title').annotate(
+            genres_count=Count('genre')
+        ).filter(genres_count=len(slugs)).values('title'))
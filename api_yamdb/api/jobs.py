@@ -0,0 +1,47 @@
+"""Фоновые задачи: массовая модерация и каскадное удаление."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY = 'job:{job_id}'
+JOB_TIMEOUT = 60 * 60 * 24
+
+# Один поток: большие задачи выполняются по очереди и не занимают
+# больше одного соединения с БД.
+executor = ThreadPoolExecutor(max_workers=1)
+
+
+def get_job(job_id):
+    return cache.get(JOB_KEY.format(job_id=job_id))
+
+
+def set_job(job_id, status, result=None):
+    cache.set(
+        JOB_KEY.format(job_id=job_id),
+        {'id': job_id, 'status': status, 'result': result},
+        JOB_TIMEOUT
+    )
+
+
+def run_job(job_id, func, *args):
+    set_job(job_id, 'running')
+    try:
+        set_job(job_id, 'done', func(*args))
+    except Exception:
+        logger.exception('Background job %s failed', job_id)
+        set_job(job_id, 'failed')
+    finally:
+        connections.close_all()
+
+
+def submit_job(func, *args):
+    """Запуск func(*args) в фоне; возвращает состояние задачи."""
+    job_id = uuid4().hex
+    set_job(job_id, 'pending')
+    executor.submit(run_job, job_id, func, *args)
+    return get_job(job_id)
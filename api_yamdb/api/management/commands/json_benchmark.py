@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import BytesIO
+from timeit import timeit
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from api.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+def titles_page(size):
+    """Страница произведений в виде, как её отдаёт TitleReadSerializer."""
+    genres = [
+        {'name': f'Жанр {idx}', 'slug': f'genre-{idx}'} for idx in range(3)
+    ]
+    return {
+        'count': 10000,
+        'next': 'http://testserver/api/v1/titles/?page=3',
+        'previous': 'http://testserver/api/v1/titles/?page=1',
+        'results': ReturnList([
+            ReturnDict({
+                'id': idx,
+                'name': f'Произведение номер {idx}',
+                'year': 1950 + idx % 70,
+                'rating': idx % 10 or None,
+                'description': 'Описание произведения. ' * 10,
+                'genre': genres,
+                'category': {'name': 'Фильмы', 'slug': 'films'},
+            }, serializer=None)
+            for idx in range(size)
+        ], serializer=None),
+    }
+
+
+def reviews_page(size):
+    """Страница отзывов с pub_date в виде datetime."""
+    now = timezone.now()
+    return {
+        'count': 10000,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': idx,
+                'text': 'Текст отзыва. ' * 20,
+                'author': f'user{idx}',
+                'score': idx % 10 + 1,
+                'pub_date': now - timedelta(minutes=idx),
+            }
+            for idx in range(size)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare FastJSONRenderer/FastJSONParser with DRF JSON classes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100)
+        parser.add_argument('--number', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed: FastJSON* fall back to DRF classes'
+            ))
+        number = options['number']
+        payloads = {
+            'titles': titles_page(options['size']),
+            'reviews': reviews_page(options['size']),
+        }
+        for name, data in payloads.items():
+            content = JSONRenderer().render(data)
+            for action, default, fast in (
+                ('render',
+                 lambda: JSONRenderer().render(data),
+                 lambda: FastJSONRenderer().render(data)),
+                ('parse',
+                 lambda: JSONParser().parse(BytesIO(content)),
+                 lambda: FastJSONParser().parse(BytesIO(content))),
+            ):
+                default_time = timeit(default, number=number) / number
+                fast_time = timeit(fast, number=number) / number
+                self.stdout.write(
+                    f'{name:8} {action:7} {len(content):8d} bytes  '
+                    f'default {default_time * 1e6:9.1f} us  '
+                    f'fast {fast_time * 1e6:9.1f} us  '
+                    f'x{default_time / fast_time:.1f}'
+                )
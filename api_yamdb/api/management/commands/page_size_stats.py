@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.metrics import get_page_size_labels, get_page_size_stats
+from api.urls import v1_router
+
+
+class Command(BaseCommand):
+    help = 'Show page sizes requested by clients per viewset'
+
+    def handle(self, *args, **options):
+        labels = get_page_size_labels()
+        self.stdout.write(
+            f'{"viewset":20}' + ''.join(f'{label:>9}' for label in labels)
+        )
+        for _, viewset, _ in v1_router.registry:
+            if viewset.pagination_class is None:
+                continue
+            stats = get_page_size_stats(viewset.__name__)
+            self.stdout.write(
+                f'{viewset.__name__:20}'
+                + ''.join(f'{stats[label]:9d}' for label in labels)
+            )
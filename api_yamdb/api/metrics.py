@@ -0,0 +1,140 @@
+"""
+Счётчики запрошенных клиентами размеров страниц.
+
+Запрос только увеличивает счётчик в памяти процесса. Накопленное
+раз в PAGE_SIZE_STATS_FLUSH_INTERVAL секунд фоновый поток добавляет
+атомарным incr в отдельный кэш METRICS_CACHE, общий для всех
+процессов, поэтому команда page_size_stats видит данные сервера.
+"""
+import atexit
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE_BUCKETS = (5, 10, 20, 50, 100, 200, 500, 1000)
+PAGE_SIZE_KEY = 'page-size-stats:{view}:{bucket}'
+METRICS_CACHE = 'metrics'
+
+flush_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def add_to_cache(counts):
+    """Атомарно прибавляет {ключ: приращение} к счётчикам METRICS_CACHE."""
+    cache = caches[METRICS_CACHE]
+    for key, delta in counts.items():
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, delta, None)
+
+
+class PageSizeCounter:
+    """
+    Счётчики процесса, ещё не добавленные в METRICS_CACHE.
+
+    Выгрузку выполняет один поток за раз; при ошибке кэша
+    счётчики возвращаются и уходят со следующей выгрузкой.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = Lock()
+        self.flush_lock = Lock()
+        self.flushed = monotonic()
+        self.scheduled = False
+
+    def increment(self, key):
+        with self.lock:
+            self.counts[key] += 1
+            if self.scheduled or monotonic() - self.flushed < (
+                settings.PAGE_SIZE_STATS_FLUSH_INTERVAL
+            ):
+                return
+            self.scheduled = True
+        flush_executor.submit(self.flush)
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                counts, self.counts = self.counts, Counter()
+                self.flushed = monotonic()
+                self.scheduled = False
+            if not counts:
+                return
+            try:
+                add_to_cache(counts)
+            except Exception:
+                logger.exception('Page size stats flush failed')
+                with self.lock:
+                    self.counts.update(counts)
+
+    def clear(self):
+        with self.flush_lock, self.lock:
+            self.counts.clear()
+            self.flushed = monotonic()
+
+
+page_size_counter = PageSizeCounter()
+atexit.register(page_size_counter.flush)
+
+
+def get_page_size_bucket(requested):
+    """Корзина запрошенного размера: ближайшая граница сверху."""
+    for bucket in PAGE_SIZE_BUCKETS:
+        if requested <= bucket:
+            return str(bucket)
+    return 'more'
+
+
+def get_page_size_labels():
+    return (
+        'default', *map(str, PAGE_SIZE_BUCKETS), 'more', 'invalid', 'capped'
+    )
+
+
+def increment(view, bucket):
+    page_size_counter.increment(PAGE_SIZE_KEY.format(view=view, bucket=bucket))
+
+
+def record_page_size(view, raw_value, max_page_size):
+    """
+    Учитывает размер страницы, запрошенный через ?page_size=.
+
+    Запросы без параметра попадают в default, некорректные
+    значения — в invalid; превышения лимита вьюсета считаются
+    дополнительно в capped.
+    """
+    if raw_value is None:
+        increment(view, 'default')
+        return
+    try:
+        requested = int(raw_value)
+    except ValueError:
+        requested = 0
+    if requested < 1:
+        increment(view, 'invalid')
+        return
+    increment(view, get_page_size_bucket(requested))
+    if max_page_size and requested > max_page_size:
+        increment(view, 'capped')
+
+
+def get_page_size_stats(view):
+    """Счётчики вьюсета по всем корзинам, включая невыгруженные."""
+    page_size_counter.flush()
+    labels = get_page_size_labels()
+    values = caches[METRICS_CACHE].get_many(
+        [PAGE_SIZE_KEY.format(view=view, bucket=label) for label in labels]
+    )
+    return {
+        label: values.get(PAGE_SIZE_KEY.format(view=view, bucket=label), 0)
+        for label in labels
+    }
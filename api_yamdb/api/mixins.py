@@ -1,9 +1,18 @@
 import re
+from hashlib import md5
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
+from api.cache import get_list_cache_key
+
 
 class NotAllowedPutMixin:
     """Миксин, запрещающий 'PUT'-запросы."""
@@ -34,3 +43,266 @@ class ValidateEmailMixin:
         if not re.match(r"^[^@]+@[^@]+\.[^@]+$", value):
             raise ValidationError("Неверный формат email.")
         return value
+
+
+class ParentObjectMixin:
+    """
+    Миксин вложенного вьюсета: родитель читается один раз за запрос.
+
+    Вьюсет создаётся на каждый запрос, поэтому результат
+    load_parent_object() кэшируется на экземпляре.
+    """
+
+    def get_parent_object(self):
+        if not hasattr(self, '_parent_object'):
+            self._parent_object = self.load_parent_object()
+        return self._parent_object
+
+    def load_parent_object(self):
+        raise NotImplementedError
+
+
+class ConditionalResponseMixin:
+    """
+    Базовый миксин условных GET-запросов.
+
+    get_resource_version() возвращает дешёвый маркер версии ресурса
+    и дату его изменения. По ним выставляются ETag и Last-Modified,
+    а на совпадающие If-None-Match/If-Modified-Since отдаётся 304
+    до выполнения основного queryset.
+    """
+
+    def get_resource_version(self):
+        """Маркер версии и дата изменения; (None, None) — без проверки."""
+        return None, None
+
+    def get_etag(self, version):
+        request = self.request
+        key = (
+            f'{version}:{request.get_full_path()}:'
+            f'{request.accepted_media_type}'
+        )
+        return f'"{md5(key.encode()).hexdigest()}"'
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version, last_modified = self.get_resource_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(version)
+        timestamp = last_modified and int(last_modified.timestamp())
+        headers = {'ETag': etag}
+        if timestamp:
+            headers['Last-Modified'] = http_date(timestamp)
+        validators = HttpResponse(headers=headers)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp, response=validators
+        )
+        if response is not validators:
+            return response
+        response = handler(request, *args, **kwargs)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+
+def record_list_page_size(view, request):
+    """Учёт размера страницы, если список отдан без пагинатора."""
+    record = getattr(view.paginator, 'record_page_size', None)
+    if record is not None:
+        record(request, view)
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    """Условный GET для списка."""
+
+    def list(self, request, *args, **kwargs):
+        response = self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            record_list_page_size(self, request)
+        return response
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    """Условный GET для объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedListMixin:
+    """
+    Миксин кэширования ответа list в кэше Django.
+
+    Ключ учитывает полный URL (поиск и пагинацию); кэш модели
+    сбрасывается сигналами при любой записи.
+    """
+
+    list_cache_timeout = 60 * 5
+
+    def list(self, request, *args, **kwargs):
+        key = get_list_cache_key(self.queryset.model, request)
+        data = cache.get(key)
+        if data is not None:
+            record_list_page_size(self, request)
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, self.list_cache_timeout)
+        return response
+
+
+def get_sparse_fieldset(request, field_names):
+    """
+    Поля, выбранные параметрами ?fields= и ?omit= GET-запроса.
+
+    None означает, что ограничений нет. Неизвестные имена игнорируются.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = request.query_params.get('fields')
+    omit = request.query_params.get('omit')
+    if not fields and not omit:
+        return None
+    fields = set(fields.split(',')) if fields else None
+    omit = set(omit.split(',')) if omit else set()
+    return [
+        name for name in field_names
+        if (fields is None or name in fields) and name not in omit
+    ]
+
+
+def get_includes(request):
+    """Имена связанных данных из ?include= GET-запроса."""
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    include = request.query_params.get('include')
+    return set(include.split(',')) if include else set()
+
+
+class IncludeMixin:
+    """
+    Миксин сериализатора: дополнительные поля по ?include=.
+
+    include_fields сопоставляет имя из ?include= с полями,
+    которые без него убираются из ответа. Поле может входить
+    в несколько групп и остаётся, если запрошена любая из них.
+    """
+
+    include_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        included = get_includes(self.context.get('request'))
+        kept = {
+            name for include in included
+            for name in self.include_fields.get(include, ())
+        }
+        for names in self.include_fields.values():
+            for name in set(names) - kept:
+                self.fields.pop(name, None)
+
+
+class SparseFieldsetMixin:
+    """Миксин сериализатора: только поля из ?fields= и ?omit=."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = get_sparse_fieldset(
+            self.context.get('request'), self.fields
+        )
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class SparseFieldsetQuerysetMixin:
+    """
+    Миксин вьюсета: queryset под ?fields= и ?omit=.
+
+    Колонки невыбранных полей откладываются через defer(),
+    а невыбранные связи убираются из select_related/prefetch_related.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if get_sparse_fieldset(self.request, ()) is None:
+            return queryset
+        deferred, relations = self.get_unused_model_fields(queryset.model)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        if relations:
+            queryset = self.prune_relations(queryset, relations)
+        return queryset
+
+    def get_unused_model_fields(self, model):
+        """Колонки и связи модели, нужные только невыбранным полям."""
+        serializer = self.get_serializer_class()()
+        selected = get_sparse_fieldset(self.request, serializer.fields)
+        deferred, relations = [], set()
+        for name, field in serializer.fields.items():
+            if name in selected or field.source == '*':
+                continue
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                continue
+            if model_field.is_relation:
+                relations.add(model_field.name)
+            elif not model_field.primary_key:
+                deferred.append(model_field.name)
+        return deferred, relations
+
+    @staticmethod
+    def prune_relations(queryset, relations):
+        """Queryset без select_related/prefetch_related для relations."""
+        prefetch = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_through', lookup).split('__')[0]
+            not in relations
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*prefetch)
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            queryset = queryset.select_related(None)
+            remaining = [name for name in select_related
+                         if name not in relations]
+            if remaining:
+                queryset = queryset.select_related(*remaining)
+        return queryset
+
+
+class FastListMixin:
+    """
+    Быстрый путь list для анонимных GET-запросов.
+
+    Строки читаются через values(fast_list_values) и превращаются
+    в словари методом get_fast_list_data без сериализаторов и
+    экземпляров моделей. Включается настройкой FAST_LIST_PATH.
+    """
+
+    fast_list_values = ()
+
+    def use_fast_list(self, request):
+        return (
+            getattr(settings, 'FAST_LIST_PATH', False)
+            and not request.user.is_authenticated
+            and get_sparse_fieldset(request, ()) is None
+            and not get_includes(request)
+        )
+
+    def get_fast_list_data(self, rows):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).values(*self.fast_list_values)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_fast_list_data(page))
+        return Response(self.get_fast_list_data(queryset))
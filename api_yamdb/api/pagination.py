@@ -0,0 +1,399 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date
+from functools import partial
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.cache import get_list_cache_version
+from api.metrics import record_page_size
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация.
+
+    Страница выбирается условием по ключу сортировки последней
+    показанной записи, а не OFFSET, поэтому стоимость запроса
+    не зависит от глубины. К сортировке всегда добавляется pk,
+    чтобы ключ был уникальным. COUNT не выполняется.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        values, reverse = self.decode_cursor(request)
+
+        ordering = self.reverse_ordering() if reverse else self.ordering
+        queryset = queryset.order_by(*(
+            F(field).desc(nulls_last=True) if descending
+            else F(field).asc(nulls_first=True)
+            for field, descending in ordering
+        ))
+        if values is not None:
+            try:
+                queryset = queryset.filter(self.after_condition(
+                    ordering, self.convert_key(queryset.model, values)
+                ))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Сортировка из OrderingFilter вьюсета, иначе из queryset/модели.
+
+        Возвращает список пар (поле, по убыванию) с pk в конце.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', ()):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = (
+                queryset.query.order_by or queryset.model._meta.ordering
+            )
+        result = []
+        for field in ordering:
+            descending = field.startswith('-')
+            field = field.lstrip('-')
+            if field == 'id':
+                field = 'pk'
+            result.append((field, descending))
+            if field == 'pk':
+                break
+        else:
+            result.append(('pk', False))
+        return result
+
+    def convert_key(self, model, values):
+        """
+        Значения ключа из курсора в типы полей модели.
+
+        Поля-аннотации (например, рейтинг) остаются как есть.
+        """
+        result = []
+        for (field, _), value in zip(self.ordering, values):
+            if value is not None:
+                try:
+                    model_field = (
+                        model._meta.pk if field == 'pk'
+                        else model._meta.get_field(field)
+                    )
+                except FieldDoesNotExist:
+                    pass
+                else:
+                    value = model_field.to_python(value)
+            result.append(value)
+        return result
+
+    def reverse_ordering(self):
+        return [(field, not descending) for field, descending in self.ordering]
+
+    @staticmethod
+    def after_condition(ordering, values):
+        """
+        Условие «строго после ключа» для составной сортировки.
+
+        NULL считается меньше любого значения, как и в order_by выше.
+        """
+        (field, descending), *rest = ordering
+        value, *rest_values = values
+        tail = (
+            KeysetPagination.after_condition(rest, rest_values)
+            if rest else None
+        )
+        if value is None:
+            if descending:
+                condition = Q(**{f'{field}__isnull': True})
+                return condition & tail if tail is not None else Q(pk__in=[])
+            condition = Q(**{f'{field}__isnull': False})
+            if tail is not None:
+                condition |= Q(**{f'{field}__isnull': True}) & tail
+            return condition
+        lookup = 'lt' if descending else 'gt'
+        condition = Q(**{f'{field}__{lookup}': value})
+        if descending:
+            condition |= Q(**{f'{field}__isnull': True})
+        if tail is not None:
+            condition |= Q(**{field: value}) & tail
+        return condition
+
+    def get_key(self, instance):
+        """Ключ записи; строки values() — словари с id вместо pk."""
+        key = []
+        for field, _ in self.ordering:
+            if isinstance(instance, dict):
+                value = instance['id' if field == 'pk' else field]
+            else:
+                value = getattr(instance, field)
+            if isinstance(value, date):
+                value = value.isoformat()
+            key.append(value)
+        return key
+
+    def encode_cursor(self, instance, reverse):
+        token = json.dumps(
+            {'k': self.get_key(instance), 'r': reverse},
+            separators=(',', ':')
+        )
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            urlsafe_b64encode(token.encode()).decode()
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(token.encode()))
+            values, reverse = cursor['k'], bool(cursor['r'])
+        except (BinasciiError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(
+                self.base_url, self.cursor_query_param, ''
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class CursorPageNumberPagination(PageNumberPagination):
+    """
+    Пагинация по номеру страницы с курсорным режимом по запросу.
+
+    Если в запросе есть параметр ?cursor= (в том числе пустой),
+    страница отдаётся через KeysetPagination. Размер страницы
+    задаётся параметром ?page_size= не больше max_page_size вьюсета;
+    запрошенные размеры учитываются в api.metrics.
+    """
+
+    keyset_pagination_class = KeysetPagination
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        self.max_page_size = getattr(
+            view, 'max_page_size', self.max_page_size
+        )
+        if view is not None:
+            self.record_page_size(request, view)
+        cursor_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            return self.paginate_page_number(queryset, request, view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.keyset = self.keyset_pagination_class(page_size)
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def record_page_size(self, request, view):
+        """
+        Учёт ?page_size= запроса в api.metrics.
+
+        Вьюсеты, отвечающие без пагинации (304, кэш списка),
+        вызывают его сами.
+        """
+        record_page_size(
+            view.__class__.__name__,
+            request.query_params.get(self.page_size_query_param),
+            getattr(view, 'max_page_size', self.max_page_size)
+        )
+
+    def paginate_page_number(self, queryset, request, view=None):
+        """Страница по номеру, если курсор не запрошен."""
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+
+class CountlessPageNumberPagination(CursorPageNumberPagination):
+    """
+    Пагинация по номеру страницы без COUNT.
+
+    Читается на одну запись больше страницы, чтобы узнать, есть ли
+    следующая; в ответе нет поля count.
+    """
+
+    def paginate_page_number(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        try:
+            self.page_number = int(
+                request.query_params.get(self.page_query_param, 1)
+            )
+        except (TypeError, ValueError):
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        if not results and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(results) > page_size
+        return results[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return self.keyset_pagination_class.get_paginated_response_schema(
+            self, schema
+        )
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param, self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт число записей из кэша."""
+
+    def __init__(self, *args, cache_key, timeout, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+
+    @cached_property
+    def count(self):
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(self.cache_key, count, self.timeout)
+        return count
+
+
+class CachedCountPageNumberPagination(CursorPageNumberPagination):
+    """
+    Пагинация по номеру страницы с кэшированным COUNT.
+
+    Ключ — вьюсет и параметры фильтрации без номера и размера
+    страницы. В ключ входят версии моделей из count_cache_models
+    вьюсета, поэтому запись в них сбрасывает закэшированные числа.
+    """
+
+    count_cache_timeout = 60
+
+    def paginate_page_number(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CachedCountPaginator,
+            cache_key=self.get_count_cache_key(queryset, request, view),
+            timeout=self.count_cache_timeout
+        )
+        return super().paginate_page_number(queryset, request, view)
+
+    def get_count_cache_key(self, queryset, request, view):
+        skip = {
+            self.page_query_param, self.page_size_query_param,
+            self.keyset_pagination_class.cursor_query_param,
+        }
+        params = sorted(
+            (key, value) for key, values in request.query_params.lists()
+            if key not in skip for value in values
+        )
+        models = getattr(view, 'count_cache_models', (queryset.model, ))
+        versions = ':'.join(
+            get_list_cache_version(model) for model in models
+        )
+        name = view.__class__.__name__ if view else queryset.model.__name__
+        digest = md5(f'{versions}:{params}'.encode()).hexdigest()
+        return f'page-count:{name}:{digest}'
@@ -25,7 +25,16 @@ class IsAuthorOrModeratorOrAdminPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
             or request.user.is_moderator
             or request.user.is_admin
         )
+
+
+class IsModeratorOrAdminPermission(permissions.BasePermission):
+    """Доступ только для moderator, admin и superuser."""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_moderator or request.user.is_admin
+        )
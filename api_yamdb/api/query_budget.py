@@ -0,0 +1,107 @@
+"""Бюджет SQL-запросов на действие вьюсета."""
+import logging
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+IN_CLAUSE = re.compile(r'IN \((?:%s, )*%s\)')
+NUMBER = re.compile(r'\b\d+\b')
+
+
+class QueryBudgetExceeded(Exception):
+    """Действие выполнило больше SQL-запросов, чем разрешено."""
+
+
+def query_budget(max_queries):
+    """
+    Декоратор действия вьюсета или api_view-функции.
+
+    Задаёт максимальное число SQL-запросов на один запрос к действию.
+    Для стандартных действий вьюсета бюджет задаётся атрибутом
+    query_budgets = {'list': 3, ...}.
+    """
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+def get_view_budget(view_func, method):
+    """Бюджет для view-функции из resolver_match и HTTP-метода."""
+    budget = getattr(view_func, 'query_budget', None)
+    view_class = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None)
+    if budget is not None or not actions:
+        return budget
+    action = actions.get(method.lower())
+    if action is None:
+        return None
+    budget = getattr(getattr(view_class, action, None), 'query_budget', None)
+    if budget is None:
+        budget = getattr(view_class, 'query_budgets', {}).get(action)
+    return budget
+
+
+def sql_shape(sql):
+    """SQL без значений: запросы одной формы отличаются только ими."""
+    return NUMBER.sub('N', IN_CLAUSE.sub('IN (...)', sql))
+
+
+class QueryRecorder:
+    """execute_wrapper, запоминающий выполненные SQL-запросы."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def repeated_shapes(self):
+        """Формы запросов, выполненные больше одного раза."""
+        shapes = Counter(sql_shape(sql) for sql in self.queries)
+        return [(shape, count) for shape, count in shapes.most_common()
+                if count > 1]
+
+
+class QueryBudgetMiddleware:
+    """
+    Проверка бюджета SQL-запросов.
+
+    Режим задаётся настройкой QUERY_BUDGET_MODE: 'log' пишет
+    предупреждение, 'raise' выбрасывает QueryBudgetExceeded,
+    пустое значение отключает проверку.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', None)
+        if not mode:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None:
+            return response
+        budget = get_view_budget(match.func, request.method)
+        if budget is None or len(recorder.queries) <= budget:
+            return response
+        message = (
+            f'{request.method} {request.path}: {len(recorder.queries)} '
+            f'SQL-запросов при бюджете {budget}.'
+        )
+        repeated = recorder.repeated_shapes()
+        if repeated:
+            shape, count = repeated[0]
+            message += f' Повторяется {count} раз: {shape}'
+        if mode == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+        return response
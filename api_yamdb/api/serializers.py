@@ -2,14 +2,18 @@ from datetime import datetime
 
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
-from api.mixins import ValidateEmailMixin, ValidateUsernameMixin
+from api.cache import invalidate_list_cache
+from api.mixins import (IncludeMixin, SparseFieldsetMixin, ValidateEmailMixin,
+                        ValidateUsernameMixin)
 from reviews.constants import (EMAIL_MAX_LENGTH, MAX_SCORE_VALUE,
-                               MIN_SCORE_VALUE, USERNAME_MAX_LENGTH)
+                               MIN_SCORE_VALUE, MODERATION_IDS_MAX_SIZE,
+                               TITLE_BULK_MAX_SIZE, USERNAME_MAX_LENGTH)
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Серилизатор для модели категорий."""
 
     class Meta:
@@ -17,7 +21,17 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class TitleCategorySerializer(CategorySerializer):
+    """Категория произведения; ожидающая удаления отдаётся как null."""
+
+    def get_attribute(self, instance):
+        category = super().get_attribute(instance)
+        if category is not None and category.deletion_pending:
+            return None
+        return category
+
+
+class GenreSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для модели жанров."""
 
     class Meta:
@@ -25,11 +39,11 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для чтения модели произведений."""
 
     genre = GenreSerializer(many=True, read_only=True)
-    category = CategorySerializer(read_only=True)
+    category = TitleCategorySerializer(read_only=True)
     rating = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
@@ -38,10 +52,104 @@ class TitleReadSerializer(serializers.ModelSerializer):
                   'description', 'genre', 'category')
 
 
+class PreloadedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, берущий объекты из context['preloaded'].
+
+    Если объекты модели загружены заранее одним запросом,
+    слаг ищется в словаре, иначе — в queryset как обычно.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(
+            self.get_queryset().model
+        )
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            return preloaded[data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        except TypeError:
+            self.fail('invalid')
+
+
+class TitleListWriteSerializer(serializers.ListSerializer):
+    """
+    Сериализатор массового создания произведений.
+
+    Жанры и категории всех элементов загружаются двумя запросами
+    из queryset полей дочернего сериализатора.
+    Ошибки возвращаются по индексам элементов; без context['atomic']
+    корректные элементы сохраняются, даже если есть ошибки в других.
+    """
+
+    def preload_relations(self, data):
+        genre_slugs, category_slugs = set(), set()
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            genres = item.get('genre')
+            if isinstance(genres, list):
+                genre_slugs.update(
+                    slug for slug in genres if isinstance(slug, str)
+                )
+            if isinstance(item.get('category'), str):
+                category_slugs.add(item['category'])
+        fields = self.child.fields
+        genres = fields['genre'].child_relation.get_queryset()
+        categories = fields['category'].get_queryset()
+        return {
+            Genre: {genre.slug: genre for genre in
+                    genres.filter(slug__in=genre_slugs)},
+            Category: {category.slug: category for category in
+                       categories.filter(slug__in=category_slugs)},
+        }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список произведений.'
+                ]
+            })
+        if len(data) > TITLE_BULK_MAX_SIZE:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Не больше {TITLE_BULK_MAX_SIZE} произведений '
+                    'за запрос.'
+                ]
+            })
+        self.context['preloaded'] = self.preload_relations(data)
+        self.item_errors = []
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append({'index': index, 'errors': exc.detail})
+        if self.item_errors and (self.context.get('atomic') or not validated):
+            raise serializers.ValidationError(self.item_errors)
+        return validated
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{key: value for key, value in item.items()
+                     if key != 'genre'})
+            for item in validated_data
+        ]
+        titles = Title.objects.bulk_create_with_genres(
+            titles, [item['genre'] for item in validated_data]
+        )
+        invalidate_list_cache(Title)
+        return titles
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для записи модели произведений."""
 
-    genre = serializers.SlugRelatedField(
+    genre = PreloadedSlugRelatedField(
         many=True,
         slug_field='slug',
         queryset=Genre.objects.all(),
@@ -49,15 +157,16 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         allow_empty=False,
         allow_null=False
     )
-    category = serializers.SlugRelatedField(
+    category = PreloadedSlugRelatedField(
         slug_field='slug',
-        queryset=Category.objects.all()
+        queryset=Category.objects.filter(deletion_pending=False)
     )
     year = serializers.IntegerField(required=True)
 
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        list_serializer_class = TitleListWriteSerializer
 
     def validate_year(self, value):
         if value > datetime.now().year:
@@ -72,16 +181,50 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели отзывов."""
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Сериализатор для модели комментариев."""
 
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
     )
 
+    class Meta:
+        model = Comment
+        fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ReviewSerializer(
+    SparseFieldsetMixin, IncludeMixin, serializers.ModelSerializer
+):
+    """
+    Сериализатор для модели отзывов.
+
+    С ?include=counts добавляется хранимое число комментариев,
+    с ?include=comments — ещё и последние комментарии, которые
+    queryset вьюсета заполняет в latest_comments.
+    """
+
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+    comments = CommentSerializer(
+        many=True, read_only=True, source='latest_comments'
+    )
+    include_fields = {
+        'comments': ('comment_count', 'comments'),
+        'counts': ('comment_count', ),
+    }
+
+    default_error_messages = {
+        'duplicate_review': 'Вы уже оставили отзыв на это произведение.'
+    }
+
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date',
+            'comment_count', 'comments'
+        )
 
     def validate_score(self, value):
         """Проверка, что оценка находится в диапазоне от 1 до 10."""
@@ -92,38 +235,42 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, data):
-        """Проверка на уникальность отзыва пользователя."""
-        request = self.context['request']
-        title_id = self.context['view'].kwargs.get('title_id')
-        if request.method == 'POST':
-            if Review.objects.filter(
-                title_id=title_id, author=request.user
-            ).exists():
-                raise serializers.ValidationError(
-                    "Вы уже оставили отзыв на это произведение."
-                )
-        return data
 
+class AuthorReviewSerializer(ReviewSerializer):
+    """Отзыв в ленте автора: с id произведения."""
 
-class CommentSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели комментариев."""
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+    comments = None
 
-    author = serializers.SlugRelatedField(
-        slug_field='username', read_only=True
-    )
+    class Meta(ReviewSerializer.Meta):
+        fields = (
+            'id', 'title', 'text', 'author', 'score', 'pub_date',
+            'comment_count'
+        )
 
-    class Meta:
-        model = Comment
-        fields = ('id', 'text', 'author', 'pub_date')
+
+class AuthorCommentSerializer(CommentSerializer):
+    """Комментарий в ленте автора: с id отзыва и произведения."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = ('id', 'title', 'review', 'text', 'author', 'pub_date')
 
 
 class UserSerializer(
-    ValidateUsernameMixin, serializers.ModelSerializer
+    SparseFieldsetMixin, IncludeMixin, ValidateUsernameMixin,
+    serializers.ModelSerializer
 ):
-    """Сериализатор для пользователей."""
+    """
+    Сериализатор для пользователей.
+
+    С ?include=counts добавляются хранимые числа отзывов и комментариев.
+    """
 
     username = serializers.CharField(max_length=USERNAME_MAX_LENGTH)
+    include_fields = {'counts': ('review_count', 'comment_count')}
 
     class Meta:
         """Мета класс пользователя."""
@@ -134,7 +281,9 @@ class UserSerializer(
             'first_name',
             'last_name',
             'role',
-            'username'
+            'username',
+            'review_count',
+            'comment_count'
         )
         model = User
 
@@ -144,6 +293,14 @@ class UserSerializer(
             raise ValidationError('Данный username уже используется.')
         return super().validate_username(value)
 
+    def update(self, instance, validated_data):
+        """Смена username меняет отзывы пользователя у произведений."""
+        old_username = instance.username
+        user = super().update(instance, validated_data)
+        if user.username != old_username:
+            Title.objects.filter(reviews__author=user).touch()
+        return user
+
 
 class TokenSerializer(serializers.Serializer):
     """Сериализатор для токена."""
@@ -196,3 +353,50 @@ class RegisterDataSerializer(
         )
 
         return user
+
+
+class ModerationSerializer(serializers.Serializer):
+    """
+    Выбор отзывов или комментариев для массового удаления.
+
+    Записи задаются списком ids или автором с необязательным
+    интервалом дат публикации [since, until).
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False, max_length=MODERATION_IDS_MAX_SIZE,
+        required=False
+    )
+    author = serializers.SlugRelatedField(
+        slug_field='username', queryset=User.objects.all(), required=False
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if ('ids' in data) == ('author' in data):
+            raise serializers.ValidationError('Укажите ids или author.')
+        if 'ids' in data and ('since' in data or 'until' in data):
+            raise serializers.ValidationError(
+                'Интервал дат задаётся только вместе с author.'
+            )
+        if data.get('since') and data.get('until') and (
+            data['since'] >= data['until']
+        ):
+            raise serializers.ValidationError(
+                'Дата since должна быть раньше until.'
+            )
+        return data
+
+    def filter_queryset(self, queryset):
+        """Записи queryset, выбранные проверенными данными."""
+        data = self.validated_data
+        if 'ids' in data:
+            return queryset.filter(pk__in=data['ids'])
+        queryset = queryset.filter(author=data['author'])
+        if 'since' in data:
+            queryset = queryset.filter(pub_date__gte=data['since'])
+        if 'until' in data:
+            queryset = queryset.filter(pub_date__lt=data['until'])
+        return queryset
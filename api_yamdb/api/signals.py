@@ -0,0 +1,51 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import user_cache
+from api.cache import invalidate_list_cache
+from api.tokens import forget_token_version, revoke_tokens
+from reviews.models import Category, Genre, Title, User
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_category_genre_lists(sender, **kwargs):
+    """Запись через API или админку сбрасывает кэш списков."""
+    invalidate_list_cache(sender)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_title_counts(sender, **kwargs):
+    """
+    Запись произведений сбрасывает закэшированные COUNT страниц.
+
+    delete_category снимает категорию с произведений через update()
+    без сигналов, поэтому кэш сбрасывается и при пометке категории
+    к удалению, и при удалении её строки после всех пачек.
+    """
+    invalidate_list_cache(Title)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created, **kwargs):
+    """
+    Изменение пользователя сбрасывает его из кэша.
+
+    Смена роли или активности ещё и отзывает выданные токены с ролью.
+    """
+    user_cache.delete(instance.pk)
+    if not created and instance.token_state_changed():
+        revoke_tokens(instance)
+    instance._loaded_token_state = instance.token_state()
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    user_cache.delete(instance.pk)
+    forget_token_version(instance.pk)
@@ -0,0 +1,62 @@
+"""Токены с ролью пользователя и их отзыв по версии."""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import User
+
+ROLE_CLAIM = 'role'
+VERSION_CLAIM = 'token_version'
+VERSION_KEY = 'token-version:{user_id}'
+
+MISSING = object()
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh-токен с ролью, флагом суперпользователя и версией токенов.
+
+    Access-токен копирует эти claims из refresh-токена, поэтому
+    права проверяются без чтения пользователя из базы.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token[ROLE_CLAIM] = user.role
+        token['is_superuser'] = user.is_superuser
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя из кэша Django.
+
+    None — пользователя нет или он неактивен. Запись в кэше живёт
+    TOKEN_VERSION_CACHE_TIMEOUT секунд, поэтому отзыв в процессах
+    с собственным кэшем вступает в силу не позже этого срока.
+    """
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key, MISSING)
+    if version is MISSING:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(VERSION_KEY.format(user_id=user_id))
+
+
+def revoke_tokens(user):
+    """Все выданные пользователю токены с ролью перестают приниматься."""
+    User.objects.filter(pk=user.pk).update(
+        token_version=F('token_version') + 1
+    )
+    forget_token_version(user.pk)
+    user.refresh_from_db(fields=('token_version', ))
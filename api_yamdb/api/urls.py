@@ -3,6 +3,8 @@ from rest_framework.routers import DefaultRouter
 
 from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
                        ReviewViewSet, TitleViewSet, UserViewSet,
+                       export_titles_ndjson, moderate_comments,
+                       moderate_reviews, moderation_job,
                        send_confirmation_code, send_token)
 
 v1_router = DefaultRouter()
@@ -23,5 +25,11 @@ urlpatterns = [
         path('signup/', send_confirmation_code),
         path('token/', send_token)
     ])),
+    path('export/titles.ndjson', export_titles_ndjson),
+    path('moderation/', include([
+        path('reviews/', moderate_reviews),
+        path('comments/', moderate_comments),
+        path('jobs/<str:job_id>/', moderation_job),
+    ])),
     path('', include(v1_router.urls)),
 ]
@@ -1,49 +1,131 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import (action, api_view,
+                                       permission_classes)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (SAFE_METHODS, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework.settings import api_settings
 
+from api import fast_path
+from api.authentication import get_user_instance
+from api.cache import get_list_cache_version
+from api.export import export_titles
 from api.filters import TitlesFilter
-from api.mixins import NotAllowedPutMixin
+from api.jobs import get_job, submit_job
+from api.mixins import (CachedListMixin, ConditionalListMixin,
+                        ConditionalRetrieveMixin, FastListMixin,
+                        NotAllowedPutMixin, ParentObjectMixin,
+                        SparseFieldsetQuerysetMixin, get_includes)
+from api.pagination import (CachedCountPageNumberPagination,
+                            CountlessPageNumberPagination)
 from api.permissions import (IsAdminOrReadPermission, IsAdminPermission,
-                             IsAuthorOrModeratorOrAdminPermission)
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, RegisterDataSerializer,
-                             ReviewSerializer, TitleReadSerializer,
-                             TitleWriteSerializer, TokenSerializer,
-                             UserSerializer)
-from reviews.models import Category, Genre, Review, Title, User
+                             IsAuthorOrModeratorOrAdminPermission,
+                             IsModeratorOrAdminPermission)
+from api.query_budget import query_budget
+from api.serializers import (AuthorCommentSerializer, AuthorReviewSerializer,
+                             CategorySerializer, CommentSerializer,
+                             GenreSerializer, ModerationSerializer,
+                             RegisterDataSerializer, ReviewSerializer,
+                             TitleReadSerializer, TitleWriteSerializer,
+                             TokenSerializer, UserSerializer)
+from api.tokens import RoleRefreshToken
+from reviews.constants import (MIN_SCORE_VALUE, REVIEW_LATEST_COMMENTS,
+                               TITLE_MULTI_GET_MAX_SIZE)
+from reviews.counters import shift_counters
+from reviews.deletion import (delete_category, delete_title, delete_user,
+                              mark_for_deletion, title_cascade_size,
+                              user_cascade_size)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.moderation import delete_comments, delete_reviews
+from reviews.search import search_titles
+
+
+def get_title_version(title_id):
+    """Маркер версии произведения и его отзывов."""
+    try:
+        modified = Title.objects.filter(
+            pk=title_id, deletion_pending=False
+        ).values_list('modified', flat=True).first()
+    except (TypeError, ValueError):
+        modified = None
+    if modified is None:
+        return None, None
+    return modified.isoformat(), modified
+
+
+def parse_ids(value, max_size):
+    """Список id из строки через запятую без повторов, в исходном порядке."""
+    try:
+        ids = list(dict.fromkeys(int(pk) for pk in value.split(',') if pk))
+    except ValueError:
+        raise ValidationError({'ids': 'Ожидается список целых чисел.'})
+    if not ids:
+        raise ValidationError({'ids': 'Обязательный параметр.'})
+    if len(ids) > max_size:
+        raise ValidationError({'ids': f'Не больше {max_size} id.'})
+    return ids
+
+
+def schedule_deletion(instance, delete, cascade_size):
+    """
+    Удаление строки с каскадом функцией delete(pk).
+
+    Небольшой каскад выполняется сразу. Иначе строка помечается
+    deletion_pending и скрывается из API, а каскад пачками
+    выполняет фоновая задача.
+    """
+    if cascade_size <= settings.DELETION_SYNC_LIMIT:
+        delete(instance.pk)
+        return
+    mark_for_deletion(instance)
+    submit_job(delete, instance.pk)
 
 
 class CategoryGenreCommonViewSet(
-    CreateModelMixin, DestroyModelMixin,
-    ListModelMixin, viewsets.GenericViewSet
+    SparseFieldsetQuerysetMixin, ConditionalListMixin, CachedListMixin,
+    FastListMixin, CreateModelMixin, DestroyModelMixin, ListModelMixin,
+    viewsets.GenericViewSet
 ):
 
     permission_classes = (IsAdminOrReadPermission, )
     filter_backends = (SearchFilter, )
     search_fields = ('name', )
     lookup_field = 'slug'
+    max_page_size = 1000
+    query_budgets = {'list': 4, 'create': 3}
+    fast_list_values = fast_path.CATEGORY_GENRE_VALUES
+
+    def get_fast_list_data(self, rows):
+        return fast_path.category_genre_data(rows)
+
+    def get_resource_version(self):
+        """Версия кэша списков: её меняет каждая запись и удаление."""
+        return get_list_cache_version(self.queryset.model), None
 
 
 class CategoryViewSet(CategoryGenreCommonViewSet):
     """list/create/delete для модели Category."""
 
-    queryset = Category.objects.all()
+    queryset = Category.objects.filter(deletion_pending=False)
     serializer_class = CategorySerializer
 
+    def perform_destroy(self, instance):
+        schedule_deletion(
+            instance, delete_category, instance.titles.count()
+        )
+
 
 class GenreViewSet(CategoryGenreCommonViewSet):
     """list/create/delete для модели Genre."""
@@ -52,29 +134,134 @@ class GenreViewSet(CategoryGenreCommonViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
+class TitleViewSet(
+    SparseFieldsetQuerysetMixin, NotAllowedPutMixin,
+    ConditionalRetrieveMixin, FastListMixin, viewsets.ModelViewSet
+):
     """CRUD для модели Title."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('year')
+    queryset = Title.objects.filter(
+        deletion_pending=False
+    ).with_rating().select_related(
+        'category').prefetch_related('genre').order_by('year')
     permission_classes = (IsAdminOrReadPermission, )
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = TitlesFilter
     ordering_fields = ('pk', 'year', 'rating')
     ordering = ('pk')
+    pagination_class = CachedCountPageNumberPagination
+    count_cache_models = (Title, Category, Genre)
+    query_budgets = {'list': 4, 'retrieve': 4}
+    fast_list_values = fast_path.TITLE_VALUES
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def get_resource_version(self):
+        if self.action != 'retrieve':
+            return None, None
+        return get_title_version(self.kwargs.get('pk'))
+
+    def get_fast_list_data(self, rows):
+        return fast_path.title_data(rows)
 
-class ReviewViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        schedule_deletion(
+            instance, delete_title, title_cascade_size(instance)
+        )
+
+    @query_budget(2)
+    @action(detail=True, filter_backends=())
+    def scores(self, request, pk=None):
+        """Количество отзывов с каждой оценкой."""
+        histogram = generics.get_object_or_404(
+            Title.objects.filter(deletion_pending=False).values_list(
+                'score_histogram', flat=True
+            ),
+            pk=pk
+        )
+        return Response([
+            {'score': score, 'count': count}
+            for score, count in enumerate(histogram, MIN_SCORE_VALUE)
+        ])
+
+    @query_budget(9)
+    @action(detail=False, methods=['POST'], filter_backends=())
+    def bulk(self, request):
+        """
+        Массовое создание произведений.
+
+        Ошибки возвращаются по индексам элементов; с ?atomic=true
+        при любой ошибке ничего не сохраняется.
+        """
+        context = self.get_serializer_context()
+        context['atomic'] = request.query_params.get(
+            'atomic', ''
+        ).lower() in ('1', 'true')
+        serializer = TitleWriteSerializer(
+            data=request.data, many=True, context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        created = [title.pk for title in serializer.save()]
+        titles = self.get_queryset().in_bulk(created)
+        return Response(
+            {
+                'created': TitleReadSerializer(
+                    [titles[pk] for pk in created], many=True
+                ).data,
+                'errors': serializer.item_errors,
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+    @query_budget(3)
+    @bulk.mapping.get
+    def bulk_retrieve(self, request):
+        """
+        Произведения по списку id (?ids=1,5,9) в порядке запроса.
+
+        Отсутствующие id возвращаются в missing.
+        """
+        ids = parse_ids(
+            request.query_params.get('ids', ''), TITLE_MULTI_GET_MAX_SIZE
+        )
+        titles = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        return Response({
+            'results': self.get_serializer(
+                [titles[pk] for pk in ids if pk in titles], many=True
+            ).data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @query_budget(4)
+    @action(detail=False, filter_backends=(),
+            pagination_class=CountlessPageNumberPagination)
+    def search(self, request):
+        """Полнотекстовый поиск по названию и описанию (?q=)."""
+        text = request.query_params.get('q', '')
+        if not text.strip():
+            raise ValidationError({'q': 'Обязательный параметр.'})
+        page = self.paginate_queryset(
+            search_titles(self.get_queryset(), text)
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class ReviewViewSet(
+    SparseFieldsetQuerysetMixin, NotAllowedPutMixin, ParentObjectMixin,
+    ConditionalListMixin, ConditionalRetrieveMixin, FastListMixin,
+    viewsets.ModelViewSet
+):
     """
     Вьюсет для модели отзывов.
 
-    Переопределяем get_queryset для получения title_id и
-    perform_create для сохранения автора и произведения.
+    Произведение из URL читается один раз за запрос и используется
+    в get_queryset, perform_create и upsert.
+    Запись отзыва и пересчёт хранимого рейтинга произведения
+    выполняются в одной транзакции.
     """
 
     serializer_class = ReviewSerializer
@@ -82,26 +269,154 @@ class ReviewViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
         IsAuthorOrModeratorOrAdminPermission,
         IsAuthenticatedOrReadOnly
     )
+    filter_backends = (OrderingFilter, )
+    ordering_fields = ('pub_date', 'score', 'comment_count')
+    query_budgets = {
+        'list': 5, 'retrieve': 3, 'create': 7, 'partial_update': 6
+    }
+    fast_list_values = fast_path.REVIEW_VALUES
 
-    def get_title_object(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, pk=title_id)
+    def load_parent_object(self):
+        return get_object_or_404(
+            Title, pk=self.kwargs.get('title_id'), deletion_pending=False
+        )
+
+    def get_resource_version(self):
+        """
+        Любое изменение отзывов обновляет дату изменения произведения.
+
+        Комментарии её не меняют, поэтому ответы с ?include=comments
+        и сортировкой по comment_count отдаются без ETag.
+        """
+        ordering = self.request.query_params.get(
+            OrderingFilter.ordering_param, ''
+        )
+        if get_includes(self.request) or 'comment_count' in ordering:
+            return None, None
+        modified = self.get_parent_object().modified
+        return modified.isoformat(), modified
+
+    def get_fast_list_data(self, rows):
+        return fast_path.review_data(rows)
 
     def get_queryset(self):
-        return self.get_title_object().reviews.select_related('author')
+        queryset = self.get_parent_object().reviews.select_related('author')
+        if 'comments' in get_includes(self.request):
+            queryset = self.include_comments(queryset)
+        return queryset
+
+    @staticmethod
+    def include_comments(queryset):
+        """
+        Последние REVIEW_LATEST_COMMENTS комментариев каждого отзыва.
+
+        Они читаются одним запросом на страницу: коррелированный
+        подзапрос с LIMIT по индексу (review, pub_date, id) выбирает
+        их id для каждого отзыва. Число комментариев хранится в отзыве.
+        """
+        comments = Comment.objects.filter(
+            review=OuterRef('review')
+        ).order_by('-pub_date', '-pk').values('pk')
+        return queryset.prefetch_related(Prefetch(
+            'comments',
+            queryset=Comment.objects.filter(
+                pk__in=Subquery(comments[:REVIEW_LATEST_COMMENTS])
+            ).select_related('author').order_by('pub_date', 'pk'),
+            to_attr='latest_comments'
+        ))
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user, title=self.get_title_object()
+        """
+        Повторный отзыв отсекает ограничение unique_review.
+
+        Конфликт превращается в ту же ошибку 400, что и раньше,
+        без предварительной проверки exists().
+        """
+        title = self.get_parent_object()
+        try:
+            with transaction.atomic():
+                review = serializer.save(
+                    author=get_user_instance(self.request.user), title=title
+                )
+                Title.objects.filter(pk=title.pk).change_scores(
+                    added=review.score
+                )
+                shift_counters(User, 'review_count', {review.author_id: 1})
+        except IntegrityError:
+            if not title.reviews.filter(
+                author_id=self.request.user.pk
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializer.error_messages['duplicate_review']
+                ]
+            })
+
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        with transaction.atomic():
+            review = serializer.save()
+            Title.objects.filter(pk=review.title_id).change_scores(
+                added=review.score, removed=old_score
+            )
+
+    def perform_destroy(self, instance):
+        delete_reviews(Review.objects.filter(pk=instance.pk))
+
+    @query_budget(7)
+    @action(detail=False, methods=['PUT'], url_path='me',
+            permission_classes=(IsAuthenticated, ))
+    def upsert(self, request, title_id=None):
+        """
+        Создание или замена своего отзыва на произведение.
+
+        Существующий отзыв блокируется на время замены; если
+        параллельный запрос успел создать отзыв, замена повторяется.
+        """
+        title = self.get_parent_object()
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    return self.save_own_review(request, title)
+            except IntegrityError:
+                if attempt:
+                    raise
+
+    def save_own_review(self, request, title):
+        review = title.reviews.select_for_update().filter(
+            author_id=request.user.pk
+        ).first()
+        old_score = review.score if review else None
+        serializer = self.get_serializer(review, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        review = serializer.save(
+            author=get_user_instance(request.user), title=title
+        )
+        Title.objects.filter(pk=title.pk).change_scores(
+            added=review.score, removed=old_score
+        )
+        if old_score is None:
+            shift_counters(User, 'review_count', {review.author_id: 1})
+        return Response(
+            serializer.data,
+            status=(
+                status.HTTP_201_CREATED if old_score is None
+                else status.HTTP_200_OK
+            )
         )
 
 
-class CommentViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
+class CommentViewSet(
+    SparseFieldsetQuerysetMixin, NotAllowedPutMixin, ParentObjectMixin,
+    viewsets.ModelViewSet
+):
     """
     Вьюсет для модели комментария.
 
-    Переопределяем get_queryset для получения id поста и
-    perform_create для сохранения автора и отзыва.
+    Отзыв вместе с произведением читается одним запросом
+    один раз за запрос и используется в get_queryset и perform_create.
+    Комментарий записывается вместе со счётчиками отзыва и автора.
     """
 
     serializer_class = CommentSerializer
@@ -109,20 +424,32 @@ class CommentViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
         IsAuthorOrModeratorOrAdminPermission,
         IsAuthenticatedOrReadOnly
     )
+    query_budgets = {
+        'list': 4, 'retrieve': 3, 'create': 6, 'partial_update': 4
+    }
 
-    def get_review_object(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        return get_object_or_404(Review, pk=review_id, title_id=title_id)
+    def load_parent_object(self):
+        return get_object_or_404(
+            Review.objects.select_related('title'),
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+            title__deletion_pending=False
+        )
 
     def get_queryset(self):
-        return self.get_review_object().comments.select_related('author')
+        return self.get_parent_object().comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            review=self.get_review_object()
-        )
+        with transaction.atomic():
+            comment = serializer.save(
+                author=get_user_instance(self.request.user),
+                review=self.get_parent_object()
+            )
+            shift_counters(Review, 'comment_count', {comment.review_id: 1})
+            shift_counters(User, 'comment_count', {comment.author_id: 1})
+
+    def perform_destroy(self, instance):
+        delete_comments(Comment.objects.filter(pk=instance.pk))
 
 
 @api_view(['POST'])
@@ -148,7 +475,11 @@ def send_confirmation_code(request):
 
 @api_view(['POST'])
 def send_token(request):
-    """Функция для получения токена при отправке кода."""
+    """
+    Функция для получения токена при отправке кода.
+
+    Токены содержат роль пользователя и версию его токенов.
+    """
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = get_object_or_404(
@@ -156,44 +487,169 @@ def send_token(request):
         username=serializer.validated_data['username']
     )
     confirmation_code = request.data.get('confirmation_code')
-    refresh = RefreshToken.for_user(user)
-    anwser = {
-        'refresh': str(refresh),
-        'access': str(refresh.access_token),
-    }
     if default_token_generator.check_token(user, confirmation_code):
-        AccessToken.for_user(user)
         user.save()
-        return Response(anwser)
+        refresh = RoleRefreshToken.for_user(user)
+        return Response({
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        })
     return Response(
         {'Error': 'Не совпадает код'},
         status=status.HTTP_400_BAD_REQUEST
     )
 
 
-class UserViewSet(NotAllowedPutMixin, viewsets.ModelViewSet):
+class UserViewSet(
+    SparseFieldsetQuerysetMixin, NotAllowedPutMixin, viewsets.ModelViewSet
+):
     """Вью-класс для пользователей."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deletion_pending=False)
     serializer_class = UserSerializer
-    pagination_class = PageNumberPagination
-    filter_backends = (SearchFilter, )
+    filter_backends = (SearchFilter, OrderingFilter)
     search_fields = ('username', )
+    ordering_fields = ('username', 'review_count', 'comment_count')
     permission_classes = (IsAuthenticated, IsAdminPermission,)
     lookup_field = 'username'
+    query_budgets = {
+        'list': 3, 'retrieve': 2, 'create': 4, 'partial_update': 5
+    }
 
+    @query_budget(4)
     @action(
         methods=['GET', 'PATCH'],
         detail=False,
         permission_classes=[IsAuthenticated, ]
     )
     def me(self, request):
-        """Получение или обновление пользователя."""
+        """
+        Получение или обновление пользователя.
+
+        request.user может быть из кэша аутентификации, поэтому
+        строка читается заново: счётчики актуальны, а PATCH
+        не перезаписывает их устаревшими значениями.
+        """
+        user = get_object_or_404(self.get_queryset(), pk=request.user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = self.get_serializer(
-            request.user, data=request.data, partial=True)
+        serializer = self.get_serializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def perform_destroy(self, instance):
+        schedule_deletion(instance, delete_user, user_cascade_size(instance))
+
+    def author_feed(self, queryset, serializer_class):
+        """
+        Страница отзывов или комментариев автора по pub_date.
+
+        Действия лент объявлены с filter_backends=(), чтобы сортировка
+        списка пользователей не попадала в курсорную пагинацию.
+        """
+        page = self.paginate_queryset(queryset.order_by('pub_date', 'pk'))
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def get_author_reviews(user):
+        return Review.objects.filter(
+            author_id=user.pk, title__deletion_pending=False
+        ).select_related('author')
+
+    @staticmethod
+    def get_author_comments(user):
+        return Comment.objects.filter(
+            author_id=user.pk, review__title__deletion_pending=False
+        ).select_related('author', 'review')
+
+    @query_budget(3)
+    @action(detail=False, url_path='me/reviews', filter_backends=(),
+            permission_classes=(IsAuthenticated, ))
+    def my_reviews(self, request):
+        """Отзывы текущего пользователя."""
+        return self.author_feed(
+            self.get_author_reviews(request.user), AuthorReviewSerializer
+        )
+
+    @query_budget(3)
+    @action(detail=False, url_path='me/comments', filter_backends=(),
+            permission_classes=(IsAuthenticated, ))
+    def my_comments(self, request):
+        """Комментарии текущего пользователя."""
+        return self.author_feed(
+            self.get_author_comments(request.user), AuthorCommentSerializer
+        )
+
+    @query_budget(4)
+    @action(detail=True, filter_backends=())
+    def reviews(self, request, username=None):
+        """Отзывы пользователя (admin)."""
+        return self.author_feed(
+            self.get_author_reviews(self.get_object()),
+            AuthorReviewSerializer
+        )
+
+    @query_budget(4)
+    @action(detail=True, filter_backends=())
+    def comments(self, request, username=None):
+        """Комментарии пользователя (admin)."""
+        return self.author_feed(
+            self.get_author_comments(self.get_object()),
+            AuthorCommentSerializer
+        )
+
+
+@api_view(['GET'])
+@permission_classes((IsAdminPermission, ))
+def export_titles_ndjson(request):
+    """Потоковая выгрузка произведений с отзывами в NDJSON (admin)."""
+    return StreamingHttpResponse(
+        export_titles(), content_type='application/x-ndjson'
+    )
+
+
+def moderate(request, queryset, delete):
+    """
+    Массовое удаление выбранных записей queryset функцией delete.
+
+    Не больше MODERATION_SYNC_LIMIT записей удаляется сразу, остальное
+    — фоновой задачей, состояние которой отдаёт moderation_job.
+    """
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    queryset = serializer.filter_queryset(queryset)
+    if queryset.count() > settings.MODERATION_SYNC_LIMIT:
+        return Response(
+            submit_job(delete, queryset), status=status.HTTP_202_ACCEPTED
+        )
+    return Response(delete(queryset))
+
+
+@api_view(['POST'])
+@permission_classes((IsModeratorOrAdminPermission, ))
+def moderate_reviews(request):
+    """Массовое удаление отзывов с пересчётом рейтингов."""
+    return moderate(request, Review.objects.all(), delete_reviews)
+
+
+@api_view(['POST'])
+@permission_classes((IsModeratorOrAdminPermission, ))
+def moderate_comments(request):
+    """Массовое удаление комментариев."""
+    return moderate(request, Comment.objects.all(), delete_comments)
+
+
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes((IsModeratorOrAdminPermission, ))
+def moderation_job(request, job_id):
+    """Состояние фоновой задачи модерации."""
+    job = get_job(job_id)
+    if job is None:
+        raise NotFound()
+    return Response(job)
@@ -33,6 +33,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.query_budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -57,6 +58,8 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+# Счётчики оценок меняются JSON-функциями SQLite, MySQL или PostgreSQL
+# (reviews.models.JSONArrayIncrement).
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -65,6 +68,21 @@ DATABASES = {
 }
 
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Счётчики api.metrics: общие для процессов сервера и команд
+    # manage.py и не вытесняются кэшированными ответами. Нужен бэкенд
+    # с атомарным incr, иначе процессы теряют приращения друг друга.
+    'metrics': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': '127.0.0.1:11211',
+        'TIMEOUT': None,
+    },
+}
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME':
@@ -103,10 +121,19 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS':
-    'rest_framework.pagination.PageNumberPagination',
+    'api.pagination.CursorPageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
@@ -115,6 +142,30 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Кэш пользователей JWT-запросов в памяти процесса
+AUTH_USER_CACHE_SIZE = 1000
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Время жизни версии токенов пользователя в кэше Django
+TOKEN_VERSION_CACHE_TIMEOUT = 30
+
+# Списки для анонимных GET-запросов без сериализаторов
+FAST_LIST_PATH = True
+
+# Как часто процесс выгружает счётчики размеров страниц в кэш metrics
+PAGE_SIZE_STATS_FLUSH_INTERVAL = 10
+
+# Проверка бюджета SQL-запросов: 'log', 'raise' или None.
+# Запись запросов замедляет каждый ответ, поэтому проверка включается
+# только в разработке и тестах.
+QUERY_BUDGET_MODE = None
+
+# Массовая модерация: больше стольких записей удаляется в фоне
+MODERATION_SYNC_LIMIT = 500
+
+# Удаление с каскадом больше стольких строк выполняется в фоне
+DELETION_SYNC_LIMIT = 500
+
 # Настройки для почты
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
 
+from reviews.counters import shift_counters
 from reviews.forms import (
     AdminUserCreationForm, AdminTitleForm, AdminUserChangeForm)
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.moderation import delete_comments, delete_reviews
 
 
 @admin.register(User)
@@ -56,8 +59,31 @@ class TitleAdmin(admin.ModelAdmin):
         return ', '.join([genre.name for genre in obj.genre.all()])
 
 
+class StoredCountersAdmin(admin.ModelAdmin):
+    """
+    Запись и удаление с пересчётом хранимых рейтингов и счётчиков.
+
+    Связи существующей записи не меняются: её счётчики пришлось бы
+    переносить между строками.
+    """
+
+    relation_fields = ()
+    delete_rows = None
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return super().get_readonly_fields(request, obj)
+        return self.relation_fields
+
+    def delete_model(self, request, obj):
+        self.delete_rows(self.model.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        self.delete_rows(queryset)
+
+
 @admin.register(Review)
-class ReviewsAdmin(admin.ModelAdmin):
+class ReviewsAdmin(StoredCountersAdmin):
     list_display = ('title', 'author', 'pub_date')
     search_fields = ('title__name', 'author__username',)
     list_filter = ('pub_date',)
@@ -66,10 +92,24 @@ class ReviewsAdmin(admin.ModelAdmin):
             'fields': (('title', 'author', 'score'), 'text'),
         }),
     )
+    relation_fields = ('title', 'author')
+    delete_rows = staticmethod(delete_reviews)
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            old_score = Review.objects.filter(pk=obj.pk).values_list(
+                'score', flat=True
+            ).first() if change else None
+            super().save_model(request, obj, form, change)
+            Title.objects.filter(pk=obj.title_id).change_scores(
+                added=obj.score, removed=old_score
+            )
+            if not change:
+                shift_counters(User, 'review_count', {obj.author_id: 1})
 
 
 @admin.register(Comment)
-class CommentsAdmin(admin.ModelAdmin):
+class CommentsAdmin(StoredCountersAdmin):
     list_display = ('review', 'author', 'pub_date')
     search_fields = ('author__username',)
     list_filter = ('pub_date',)
@@ -78,3 +118,12 @@ class CommentsAdmin(admin.ModelAdmin):
             'fields': (('review', 'author'), 'text'),
         }),
     )
+    relation_fields = ('review', 'author')
+    delete_rows = staticmethod(delete_comments)
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if not change:
+                shift_counters(Review, 'comment_count', {obj.review_id: 1})
+                shift_counters(User, 'comment_count', {obj.author_id: 1})
@@ -15,3 +15,21 @@ FIELD_MAX_LENGTH = 256
 
 EMAIL_MAX_LENGTH = 254
 # Максимальная длина email
+
+TITLE_BULK_MAX_SIZE = 1000
+# Максимальное число произведений в одном запросе массового создания
+
+TITLE_MULTI_GET_MAX_SIZE = 100
+# Максимальное число id в одном запросе произведений по списку
+
+REVIEW_LATEST_COMMENTS = 3
+# Число последних комментариев отзыва в ответе с ?include=comments
+
+MODERATION_CHUNK_SIZE = 500
+# Число отзывов или комментариев, удаляемых одной транзакцией
+
+MODERATION_IDS_MAX_SIZE = 10000
+# Максимальное число id в одном запросе массовой модерации
+
+DELETION_CHUNK_SIZE = 500
+# Число строк, удаляемых или обновляемых одной транзакцией при каскаде
@@ -0,0 +1,43 @@
+"""Хранимые счётчики отзывов и комментариев."""
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from reviews.models import Comment, Review, User
+
+
+def shift_counters(model, field, deltas):
+    """
+    Атомарное изменение счётчика field на {pk: приращение}.
+
+    Строки с одинаковым приращением меняются одним UPDATE с F(),
+    поэтому параллельные изменения не теряются.
+    """
+    pks_by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if delta:
+            pks_by_delta[delta].append(pk)
+    for delta, pks in pks_by_delta.items():
+        model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+
+
+def count_subquery(queryset, field):
+    """Число строк queryset со ссылкой field на внешнюю строку."""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts), 0, output_field=IntegerField())
+
+
+def rebuild_counters():
+    """Пересчёт всех счётчиков по таблицам отзывов и комментариев."""
+    return {
+        'reviews': Review.objects.update(
+            comment_count=count_subquery(Comment.objects, 'review')
+        ),
+        'users': User.objects.update(
+            review_count=count_subquery(Review.objects, 'author'),
+            comment_count=count_subquery(Comment.objects, 'author'),
+        ),
+    }
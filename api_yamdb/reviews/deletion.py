@@ -0,0 +1,96 @@
+"""
+Каскадное удаление произведений, категорий и пользователей пачками.
+
+Вместо сборщика Django, который читает все связанные объекты
+в память и удаляет их одной транзакцией, зависимые строки удаляются
+или обновляются пачками, каждая в своей транзакции. Сама строка
+удаляется последней, когда зависимых уже нет.
+"""
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from reviews.constants import DELETION_CHUNK_SIZE
+from reviews.models import Category, Comment, Review, Title, User
+from reviews.moderation import delete_comments, delete_reviews, lock_chunk
+
+
+def mark_for_deletion(instance):
+    """Строка сразу скрывается из API до фонового удаления."""
+    instance.deletion_pending = True
+    update_fields = ['deletion_pending']
+    if isinstance(instance, User):
+        instance.is_active = False
+        update_fields.append('is_active')
+    instance.save(update_fields=update_fields)
+
+
+def review_comments(reviews):
+    """Комментарии к отзывам по хранимым счётчикам, без их чтения."""
+    return reviews.aggregate(total=Sum('comment_count'))['total'] or 0
+
+
+def title_cascade_size(title):
+    """Число отзывов и комментариев, удаляемых с произведением."""
+    return title.review_count + review_comments(title.reviews.all())
+
+
+def user_cascade_size(user):
+    """
+    Число отзывов и комментариев, удаляемых с пользователем.
+
+    Учитываются и чужие комментарии к его отзывам.
+    """
+    return user.review_count + user.comment_count + review_comments(
+        user.reviews.all()
+    )
+
+
+def delete_title(title_id, chunk_size=DELETION_CHUNK_SIZE):
+    """Комментарии, отзывы, затем само произведение."""
+    delete_comments(
+        Comment.objects.filter(review__title_id=title_id), chunk_size
+    )
+    delete_reviews(Review.objects.filter(title_id=title_id), chunk_size)
+    Title.objects.filter(pk=title_id).delete()
+
+
+def delete_user(user_id, chunk_size=DELETION_CHUNK_SIZE):
+    """
+    Комментарии и отзывы пользователя, затем сам пользователь.
+
+    Отзывы удаляются с пересчётом хранимых рейтингов произведений.
+    """
+    delete_comments(Comment.objects.filter(author_id=user_id), chunk_size)
+    delete_reviews(Review.objects.filter(author_id=user_id), chunk_size)
+    User.objects.filter(pk=user_id).delete()
+
+
+def delete_category(category_id, chunk_size=DELETION_CHUNK_SIZE):
+    """Категория снимается с произведений пачками, затем удаляется."""
+    titles = Title.objects.filter(category_id=category_id)
+    while True:
+        with transaction.atomic():
+            chunk = lock_chunk(titles, ('pk', ), chunk_size)
+            if not chunk:
+                break
+            Title.objects.filter(pk__in=[pk for pk, in chunk]).update(
+                category=None, modified=timezone.now()
+            )
+    Category.objects.filter(pk=category_id).delete()
+
+
+def resume_deletions():
+    """Удаление строк, помеченных, но не удалённых (например, до рестарта)."""
+    deleted = {}
+    for model, delete in (
+        (Title, delete_title), (Category, delete_category),
+        (User, delete_user),
+    ):
+        pks = list(model.objects.filter(
+            deletion_pending=True
+        ).values_list('pk', flat=True))
+        for pk in pks:
+            delete(pk)
+        deleted[model._meta.label] = len(pks)
+    return deleted
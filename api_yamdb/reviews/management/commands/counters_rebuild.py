@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored comment and review counters of reviews and users'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters rebuilt for {updated["reviews"]} reviews '
+            f'and {updated["users"]} users'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.deletion import resume_deletions
+
+
+class Command(BaseCommand):
+    help = 'Finish cascade deletions of rows marked as pending deletion'
+
+    def handle(self, *args, **options):
+        for label, count in resume_deletions().items():
+            self.stdout.write(self.style.SUCCESS(f'{label}: {count} deleted'))
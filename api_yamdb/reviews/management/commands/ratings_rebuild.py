@@ -0,0 +1,53 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.constants import MIN_SCORE_VALUE
+from reviews.models import Review, Title, empty_score_histogram
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored score sums, review counts and score histograms'
+
+    def handle(self, *args, **options):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        with transaction.atomic():
+            updated = Title.objects.update(
+                score_sum=Coalesce(
+                    Subquery(reviews.annotate(total=Sum('score'))
+                             .values('total')),
+                    0, output_field=IntegerField()
+                ),
+                review_count=Coalesce(
+                    Subquery(reviews.annotate(total=Count('pk'))
+                             .values('total')),
+                    0, output_field=IntegerField()
+                ),
+                score_histogram=empty_score_histogram()
+            )
+            self.rebuild_histograms()
+        self.stdout.write(
+            self.style.SUCCESS(f'Ratings rebuilt for {updated} titles')
+        )
+
+    def rebuild_histograms(self):
+        counts = Review.objects.order_by('title_id', 'score').values_list(
+            'title_id', 'score'
+        ).annotate(total=Count('pk')).iterator()
+        titles = []
+        for title_id, rows in groupby(counts, key=lambda row: row[0]):
+            histogram = empty_score_histogram()
+            for _, score, total in rows:
+                histogram[score - MIN_SCORE_VALUE] = total
+            titles.append(Title(pk=title_id, score_histogram=histogram))
+            if len(titles) == BATCH_SIZE:
+                Title.objects.bulk_update(titles, ['score_histogram'])
+                titles = []
+        Title.objects.bulk_update(titles, ['score_histogram'])
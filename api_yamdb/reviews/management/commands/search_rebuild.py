@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_title_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild full-text search index of titles'
+
+    def handle(self, *args, **options):
+        rebuild_title_search_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
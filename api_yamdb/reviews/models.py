@@ -1,7 +1,12 @@
 """Модели приложения reviews."""
+from collections import Counter
+
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Func
+from django.db.models.functions import NullIf
+from django.utils import timezone
 
 from reviews.constants import (EMAIL_MAX_LENGTH, FIELD_MAX_LENGTH,
                                LENGTH_TO_DISPLAY, MAX_SCORE_VALUE,
@@ -53,6 +58,21 @@ class User(AbstractUser):
         max_length=max(len(role[1]) for role in USER_ROLE),
         choices=USER_ROLE, default='user'
     )
+    deletion_pending = models.BooleanField(
+        default=False, editable=False, verbose_name='Ожидает удаления'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество отзывов'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Версия токенов'
+    )
+
+    # Поля, изменение которых отзывает выданные токены
+    TOKEN_FIELDS = ('role', 'is_superuser', 'is_active')
 
     class Meta:
         """Мета класс пользователя."""
@@ -64,6 +84,23 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные TOKEN_FIELDS для token_state_changed."""
+        instance = super().from_db(db, field_names, values)
+        if set(cls.TOKEN_FIELDS) <= set(field_names):
+            instance._loaded_token_state = instance.token_state()
+        return instance
+
+    def token_state(self):
+        return tuple(getattr(self, field) for field in self.TOKEN_FIELDS)
+
+    def token_state_changed(self):
+        """Изменились ли роль или активность с момента загрузки."""
+        return getattr(self, '_loaded_token_state', None) != (
+            self.token_state()
+        )
+
     @property
     def is_admin(self):
         """Проверка на админа."""
@@ -75,6 +112,140 @@ class User(AbstractUser):
         return self.role == self.MODERATOR
 
 
+def empty_score_histogram():
+    """Счётчики оценок от MIN_SCORE_VALUE до MAX_SCORE_VALUE."""
+    return [0] * (MAX_SCORE_VALUE - MIN_SCORE_VALUE + 1)
+
+
+class JSONArrayIncrement(Func):
+    """
+    JSON-массив с увеличенными элементами: {индекс: приращение}.
+
+    В SQLite и MySQL — JSON_SET с JSON_EXTRACT, в PostgreSQL —
+    вложенные jsonb_set. Строка не читается отдельным запросом.
+    """
+
+    output_field = models.JSONField()
+
+    def __init__(self, expression, deltas):
+        super().__init__(expression)
+        self.deltas = deltas
+
+    def as_sql(self, compiler, connection, **extra_context):
+        array, array_params = compiler.compile(self.source_expressions[0])
+        sql, params = [array], list(array_params)
+        for index, delta in self.deltas.items():
+            sql.append(f'%s, JSON_EXTRACT({array}, %s) + %s')
+            params += [f'$[{index}]', *array_params, f'$[{index}]', delta]
+        return f'JSON_SET({", ".join(sql)})', params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        array, array_params = compiler.compile(self.source_expressions[0])
+        sql, params = array, list(array_params)
+        for index, delta in self.deltas.items():
+            sql = (
+                f'jsonb_set({sql}, %s::text[], '
+                f'to_jsonb(({array} ->> %s)::integer + %s))'
+            )
+            params += [f'{{{index}}}', *array_params, index, delta]
+        return sql, params
+
+
+def score_histogram_change(added=None, removed=None):
+    """
+    Выражение атомарного изменения счётчиков оценок.
+
+    Счётчики хранятся JSON-массивом и меняются JSONArrayIncrement
+    прямо в UPDATE, без чтения строки.
+    """
+    deltas = Counter()
+    for score, delta in ((added, 1), (removed, -1)):
+        if score is not None:
+            deltas[score] += delta
+    return score_histogram_deltas(deltas)
+
+
+def score_histogram_deltas(deltas):
+    """Выражение изменения счётчиков на {оценка: приращение}."""
+    deltas = {
+        score - MIN_SCORE_VALUE: delta
+        for score, delta in deltas.items() if delta
+    }
+    if not deltas:
+        return F('score_histogram')
+    return JSONArrayIncrement(F('score_histogram'), deltas)
+
+
+class TitleQuerySet(models.QuerySet):
+    """Набор запросов для произведений."""
+
+    def with_rating(self):
+        """
+        Рейтинг из хранимых суммы и количества оценок, без join.
+
+        Средняя оценка точная: по ней сортируют и строят курсор,
+        округление до целого — при выводе.
+        """
+        return self.annotate(rating=ExpressionWrapper(
+            F('score_sum') * 1.0 / NullIf(F('review_count'), 0),
+            output_field=models.FloatField()
+        ))
+
+    def change_scores(self, added=None, removed=None):
+        """
+        Атомарный учёт добавленной и/или удалённой оценки.
+
+        Меняет сумму и количество оценок и их распределение.
+        """
+        count_delta = int(added is not None) - int(removed is not None)
+        return self.update(
+            score_sum=F('score_sum') + (added or 0) - (removed or 0),
+            review_count=F('review_count') + count_delta,
+            score_histogram=score_histogram_change(added, removed),
+            modified=timezone.now()
+        )
+
+    def remove_scores(self, scores):
+        """Атомарный учёт нескольких удалённых оценок одним UPDATE."""
+        return self.update(
+            score_sum=F('score_sum') - sum(scores),
+            review_count=F('review_count') - len(scores),
+            score_histogram=score_histogram_deltas(
+                {score: -count for score, count in Counter(scores).items()}
+            ),
+            modified=timezone.now()
+        )
+
+    def touch(self):
+        """Отметка об изменении произведений или их отзывов."""
+        return self.update(modified=timezone.now())
+
+    def bulk_create_with_genres(self, titles, genres):
+        """
+        Массовая вставка произведений и связей с жанрами.
+
+        genres — списки жанров в порядке titles. Если СУБД не возвращает
+        pk из bulk_create (SQLite в Django 3.2), они читаются внутри той
+        же транзакции: в SQLite она держит блокировку записи, поэтому
+        последние pk принадлежат только что вставленным строкам.
+        """
+        with transaction.atomic(using=self.db):
+            self.bulk_create(titles)
+            if titles and titles[0].pk is None:
+                pks = self.model.objects.using(self.db).order_by(
+                    '-pk'
+                ).values_list('pk', flat=True)[:len(titles)]
+                for title, pk in zip(titles, reversed(list(pks))):
+                    title.pk = pk
+                    title._state.adding = False
+            GenreTitle.objects.using(self.db).bulk_create(
+                GenreTitle(title=title, genre=genre)
+                for title, title_genres in zip(titles, genres)
+                for genre in dict.fromkeys(title_genres)
+            )
+        return titles
+
+
 class Title(models.Model):
     """Модель произведения."""
 
@@ -92,9 +263,28 @@ class Title(models.Model):
     category = models.ForeignKey('Category', on_delete=models.SET_NULL,
                                  null=True, related_name='titles',
                                  verbose_name='Категория')
+    score_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество отзывов'
+    )
+    score_histogram = models.JSONField(
+        default=empty_score_histogram, editable=False,
+        verbose_name='Распределение оценок'
+    )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
+    deletion_pending = models.BooleanField(
+        default=False, editable=False, verbose_name='Ожидает удаления'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ['year']
+        indexes = [models.Index(fields=['year', 'id'])]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -105,6 +295,10 @@ class Title(models.Model):
 class Category(BaseCategoryGenreModel):
     """Модель категории."""
 
+    deletion_pending = models.BooleanField(
+        default=False, editable=False, verbose_name='Ожидает удаления'
+    )
+
     class Meta(BaseCategoryGenreModel.Meta):
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
@@ -124,6 +318,14 @@ class GenreTitle(models.Model):
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [models.Index(fields=['title', 'genre'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'], name='unique_genre_title'
+            )
+        ]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
@@ -154,9 +356,16 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name='Дата публикации'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
 
     class Meta:
         ordering = ['pub_date']
+        indexes = [
+            models.Index(fields=['title', 'pub_date', 'id']),
+            models.Index(fields=['author', 'pub_date', 'id']),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         constraints = [
@@ -190,6 +399,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['pub_date']
+        indexes = [
+            models.Index(fields=['review', 'pub_date', 'id']),
+            models.Index(fields=['author', 'pub_date', 'id']),
+        ]
         verbose_name = 'Комментарии'
         verbose_name_plural = 'Комментарий'
 
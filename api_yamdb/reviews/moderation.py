@@ -0,0 +1,94 @@
+"""Массовое удаление отзывов и комментариев модераторами."""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from reviews.constants import MODERATION_CHUNK_SIZE
+from reviews.counters import shift_counters
+from reviews.models import Comment, Review, Title, User
+
+
+def lock_chunk(queryset, fields, chunk_size):
+    """
+    Очередная пачка строк queryset, заблокированная до конца транзакции.
+
+    Удалённые строки выпадают из выборки, поэтому пачка всегда
+    читается с начала, без OFFSET.
+    """
+    return list(
+        queryset.select_for_update().order_by('pk').values_list(
+            *fields
+        )[:chunk_size]
+    )
+
+
+def delete_reviews(queryset, chunk_size=MODERATION_CHUNK_SIZE):
+    """
+    Удаление отзывов пачками с пересчётом хранимых рейтингов и счётчиков.
+
+    Каждая пачка удаляется в своей транзакции: отзывы и их комментарии
+    — по списку pk, оценки вычитаются одним UPDATE на произведение.
+    """
+    summary = {'reviews': 0, 'comments': 0, 'titles': 0}
+    titles = set()
+    while True:
+        with transaction.atomic():
+            chunk = lock_chunk(
+                queryset, ('pk', 'title_id', 'score', 'author_id'),
+                chunk_size
+            )
+            if not chunk:
+                break
+            pks = [pk for pk, _, _, _ in chunk]
+            scores = defaultdict(list)
+            for _, title_id, score, _ in chunk:
+                scores[title_id].append(score)
+            comment_authors = Comment.objects.filter(
+                review_id__in=pks
+            ).order_by().values('author_id').annotate(total=Count('pk'))
+            comment_counts = {
+                row['author_id']: -row['total'] for row in comment_authors
+            }
+            _, deleted = Review.objects.filter(pk__in=pks).delete()
+            for title_id, title_scores in scores.items():
+                Title.objects.filter(pk=title_id).remove_scores(title_scores)
+            review_counts = Counter(author_id for *_, author_id in chunk)
+            shift_counters(User, 'review_count', {
+                author_id: -count for author_id, count in review_counts.items()
+            })
+            shift_counters(User, 'comment_count', comment_counts)
+        summary['reviews'] += deleted.get(Review._meta.label, 0)
+        summary['comments'] += deleted.get(Comment._meta.label, 0)
+        titles.update(scores)
+    summary['titles'] = len(titles)
+    return summary
+
+
+def delete_comments(queryset, chunk_size=MODERATION_CHUNK_SIZE):
+    """
+    Удаление комментариев пачками, каждая в своей транзакции.
+
+    Счётчики отзывов и авторов уменьшаются в той же транзакции.
+    """
+    summary = {'comments': 0}
+    while True:
+        with transaction.atomic():
+            chunk = lock_chunk(
+                queryset, ('pk', 'review_id', 'author_id'), chunk_size
+            )
+            if not chunk:
+                break
+            deleted, _ = Comment.objects.filter(
+                pk__in=[pk for pk, _, _ in chunk]
+            ).delete()
+            reviews = Counter(review_id for _, review_id, _ in chunk)
+            authors = Counter(author_id for _, _, author_id in chunk)
+            shift_counters(Review, 'comment_count', {
+                review_id: -count for review_id, count in reviews.items()
+            })
+            shift_counters(User, 'comment_count', {
+                author_id: -count for author_id, count in authors.items()
+            })
+        summary['comments'] += deleted
+    return summary
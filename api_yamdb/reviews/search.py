@@ -0,0 +1,121 @@
+"""Полнотекстовый поиск произведений через SQLite FTS5."""
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+TITLE_FTS_TABLE = 'reviews_title_fts'
+SEARCH_WORD = re.compile(r'\w+')
+
+CREATE_TITLE_FTS_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_FTS_TABLE} USING fts5(
+        name, description, content='reviews_title', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}(
+            {TITLE_FTS_TABLE}, rowid, name, description
+        ) VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}(
+            {TITLE_FTS_TABLE}, rowid, name, description
+        ) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+
+def is_search_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def create_title_search_index(using='default', **kwargs):
+    """
+    Создание FTS5-таблицы и триггеров синхронизации с reviews_title.
+
+    Подключается к сигналу post_migrate; повторный вызов безопасен.
+    """
+    connection = connections[using]
+    if not is_search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in CREATE_TITLE_FTS_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_title_search_index(using='default'):
+    """Полная перестройка индекса по содержимому reviews_title."""
+    connection = connections[using]
+    if not is_search_supported(connection):
+        return
+    create_title_search_index(using)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}) "
+            "VALUES ('rebuild')"
+        )
+
+
+def build_match_query(text):
+    """
+    Запрос FTS5 из пользовательского текста.
+
+    Слова берутся в кавычки, чтобы символы синтаксиса FTS5
+    не ломали запрос; последнее слово ищется по префиксу.
+    """
+    words = SEARCH_WORD.findall(text)
+    if not words:
+        return None
+    *words, last = words
+    return ' '.join([f'"{word}"' for word in words] + [f'"{last}"*'])
+
+
+def search_titles(queryset, text):
+    """
+    Произведения, подходящие под запрос, по убыванию релевантности.
+
+    Релевантность доступна в аннотации search_rank (меньше — лучше).
+    Для СУБД без FTS5 используется поиск по вхождению подстроки.
+    """
+    match_query = build_match_query(text)
+    if match_query is None:
+        return queryset.none()
+    if not is_search_supported(connections[queryset.db]):
+        words = SEARCH_WORD.findall(text)
+        condition = Q()
+        for word in words:
+            condition &= (
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset.filter(condition).annotate(
+            search_rank=RawSQL('0', (), output_field=FloatField())
+        ).order_by('search_rank', 'pk')
+    return queryset.extra(
+        tables=[TITLE_FTS_TABLE],
+        where=[
+            f'{TITLE_FTS_TABLE}.rowid = reviews_title.id',
+            f'{TITLE_FTS_TABLE} MATCH %s',
+        ],
+        params=[match_query],
+    ).annotate(
+        search_rank=RawSQL(
+            f'{TITLE_FTS_TABLE}.rank', (), output_field=FloatField()
+        )
+    ).order_by('search_rank', 'pk')
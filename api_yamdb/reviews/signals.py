@@ -0,0 +1,38 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.moderation import delete_comments, delete_reviews
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, created=False, **kwargs):
+    """Правка или удаление категории меняет её произведения."""
+    if not created:
+        Title.objects.filter(category=instance).touch()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, created=False, **kwargs):
+    """Правка или удаление жанра меняет его произведения."""
+    if not created:
+        Title.objects.filter(genre=instance).touch()
+
+
+@receiver(pre_delete, sender=Title)
+def delete_title_reviews(sender, instance, **kwargs):
+    """
+    Отзывы удаляются до сборщика Django с пересчётом счётчиков авторов.
+
+    Так delete() модели, queryset и админки не портит хранимые счётчики.
+    """
+    delete_reviews(Review.objects.filter(title=instance))
+
+
+@receiver(pre_delete, sender=User)
+def delete_user_reviews(sender, instance, **kwargs):
+    """Комментарии и отзывы пользователя — с пересчётом счётчиков."""
+    delete_comments(Comment.objects.filter(author=instance))
+    delete_reviews(Review.objects.filter(author=instance))
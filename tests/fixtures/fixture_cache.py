@@ -0,0 +1,28 @@
+import pytest
+from django.core.cache import cache
+from api.authentication import user_cache
+from api.metrics import METRICS_CACHE, page_size_counter
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path):
+    """
+    Кэш не очищается вместе с тестовой БД, поэтому сбрасываем его.
+
+    Кэш метрик на время теста заменяется отдельным кэшем в памяти.
+    """
+    settings.CACHES = {
+        **settings.CACHES,
+        METRICS_CACHE: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': str(tmp_path),
+            'TIMEOUT': None,
+        },
+    }
+    cache.clear()
+    user_cache.clear()
+    page_size_counter.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+    page_size_counter.clear()
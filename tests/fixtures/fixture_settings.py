@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def query_budget_mode(settings):
+    """В тестах превышение бюджета SQL-запросов — ошибка."""
+    settings.QUERY_BUDGET_MODE = 'raise'
@@ -0,0 +1,152 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.sql import UpdateQuery
+from reviews.models import Title, score_histogram_deltas
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAPI:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    SCORES_URL_TEMPLATE = '/api/v1/titles/{title_id}/scores/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def get_scores(self, client, title_id):
+        response = client.get(
+            self.SCORES_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.SCORES_URL_TEMPLATE}` возвращает ответ со статусом 200.'
+        )
+        return {item['score']: item['count'] for item in response.json()}
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 2)
+        review = create_single_review(user_client, title_id, 'text', 7).json()
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при создании отзыва.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки отзыва.'
+        )
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            )
+        )
+        assert self.get_rating(admin_client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+    def test_02_ratings_rebuild(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 3)
+        Title.objects.update(score_sum=100, review_count=0)
+
+        call_command('ratings_rebuild')
+        assert self.get_rating(admin_client, title_id) == 3, (
+            'Проверьте, что команда `ratings_rebuild` восстанавливает '
+            'хранимый рейтинг произведений.'
+        )
+        assert self.get_rating(admin_client, titles[1]['id']) is None
+
+    def test_03_score_histogram(self, client, admin_client, user_client,
+                                moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        expected = dict.fromkeys(range(1, 11), 0)
+        assert self.get_scores(client, title_id) == expected
+
+        create_single_review(admin_client, title_id, 'text', 3)
+        create_single_review(moderator_client, title_id, 'text', 3)
+        review = create_single_review(user_client, title_id, 'text', 7).json()
+        assert self.get_scores(client, title_id) == {
+            **expected, 3: 2, 7: 1
+        }, (
+            'Проверьте, что распределение оценок обновляется '
+            'при создании отзывов.'
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review['id']
+        )
+        user_client.patch(url, data={'score': 10})
+        assert self.get_scores(client, title_id) == {
+            **expected, 3: 2, 10: 1
+        }
+        user_client.delete(url)
+        assert self.get_scores(client, title_id) == {**expected, 3: 2}
+
+        Title.objects.update(score_histogram=[0] * 10)
+        call_command('ratings_rebuild')
+        assert self.get_scores(client, title_id) == {**expected, 3: 2}, (
+            'Проверьте, что команда `ratings_rebuild` восстанавливает '
+            'распределение оценок.'
+        )
+
+        response = client.get(self.SCORES_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('fast_path', [True, False])
+    def test_04_ordering_by_exact_rating(self, client, settings, fast_path):
+        settings.FAST_LIST_PATH = fast_path
+        for name, score_sum, review_count in (
+            ('Семь', 7, 1), ('Семь и две трети', 23, 3), ('Шесть', 6, 1)
+        ):
+            Title.objects.create(
+                name=name, year=2000, description='',
+                score_sum=score_sum, review_count=review_count
+            )
+        for url in ('/api/v1/titles/', '/api/v1/titles/?cursor='):
+            results = client.get(url, {'ordering': '-rating'}).json()[
+                'results'
+            ]
+            assert [
+                (title['name'], title['rating']) for title in results
+            ] == [('Семь и две трети', 7), ('Семь', 7), ('Шесть', 6)], (
+                'Проверьте, что произведения сортируются по точной средней '
+                'оценке, а `rating` в ответе округляется вниз.'
+            )
+
+    def test_05_score_histogram_postgresql(self, monkeypatch):
+        query = UpdateQuery(Title)
+        query.add_update_values({
+            'score_histogram': score_histogram_deltas({3: 1, 10: -1})
+        })
+        monkeypatch.setattr(connection, 'vendor', 'postgresql')
+        sql, params = query.get_compiler(connection=connection).as_sql()
+        assert sql.count('jsonb_set(') == 2, (
+            'Проверьте, что в PostgreSQL распределение оценок меняется '
+            'через `jsonb_set`.'
+        )
+        assert 'JSON_SET' not in sql
+        assert params[:6] == ('{2}', 2, 1, '{9}', 9, -1)
@@ -0,0 +1,113 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPaginationAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_titles(self):
+        ratings = [None, 3, 7, None, 3, 10, 1, 7, None, 5, 3, 8]
+        for idx, rating in enumerate(ratings):
+            Title.objects.create(
+                name=f'title {idx}',
+                year=1990 + idx % 4,
+                description='',
+                score_sum=rating or 0,
+                review_count=1 if rating else 0
+            )
+        return Title.objects.with_rating()
+
+    def walk(self, client, url, key='name'):
+        names = []
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что курсорный GET-запрос к `{url}` '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            names.extend(item[key] for item in data['results'])
+            pages.append(data)
+            url = data['next']
+        return names, pages
+
+    @pytest.mark.parametrize('ordering', ['', 'year', '-year',
+                                          'rating', '-rating', '-pk'])
+    def test_01_cursor_walk_matches_ordering(self, client, ordering):
+        titles = self.create_titles()
+        url = f'{self.TITLES_URL}?cursor=&ordering={ordering}'
+        names, pages = self.walk(client, url)
+
+        field = ordering.lstrip('-') or 'pk'
+        descending = ordering.startswith('-')
+        expected = sorted(
+            titles,
+            key=lambda title: (
+                getattr(title, field) is not None,
+                getattr(title, field) or 0,
+                title.pk if not descending else -title.pk
+            ),
+            reverse=descending
+        )
+        assert names == [title.name for title in expected], (
+            'Проверьте, что курсорная пагинация проходит все произведения '
+            'в порядке, заданном параметром `ordering`, без пропусков '
+            'и повторов.'
+        )
+
+        previous = pages[-1]['previous']
+        response = client.get(previous)
+        assert response.json()['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` курсорной пагинации '
+            'возвращает предыдущую страницу.'
+        )
+
+    def test_02_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('key', [
+        ['not a date', 1], [{'a': 1}, 1], ['2020-01-01T00:00:00', 'x'],
+    ])
+    def test_02_01_tampered_cursor(self, client, key):
+        title = self.create_titles().first()
+        token = urlsafe_b64encode(
+            json.dumps({'k': key, 'r': False}).encode()
+        ).decode()
+        response = client.get(
+            f'{self.TITLES_URL}{title.pk}/reviews/', {'cursor': token}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор с некорректными значениями ключа '
+            'возвращает 404.'
+        )
+
+    def test_03_page_number_still_default(self, client):
+        self.create_titles()
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 12
+
+    def test_04_reviews_cursor_walk(self, client):
+        title = self.create_titles().first()
+        for idx in range(7):
+            author = User.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+        names, _ = self.walk(
+            client, f'{self.TITLES_URL}{title.pk}/reviews/?cursor=', 'text'
+        )
+        assert names == [f'review {idx}' for idx in range(7)], (
+            'Проверьте, что курсорная пагинация отзывов проходит '
+            'все отзывы в порядке `pub_date`.'
+        )
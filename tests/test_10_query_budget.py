@@ -0,0 +1,67 @@
+import pytest
+from api.query_budget import QueryRecorder
+from api.urls import v1_router
+from tests.utils import check_query_budget, create_comments, route_urls
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryBudget:
+
+    @pytest.fixture
+    def lookups(self, admin_client, admin, user_client, user,
+                moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        kwargs = {
+            'title_id': titles[0]['id'],
+            'review_id': reviews[0]['id'],
+        }
+        return kwargs, {
+            'titles': titles[0]['id'],
+            'reviews': reviews[0]['id'],
+            'comments': comments[0]['id'],
+            'users': user.username,
+            'categories': None,
+            'genres': None,
+        }
+
+    @pytest.mark.parametrize(
+        'prefix,basename',
+        [(prefix, basename) for prefix, _, basename in v1_router.registry]
+    )
+    def test_01_route_query_budget(self, prefix, basename, lookups,
+                                   admin_client, client, settings,
+                                   django_assert_max_num_queries):
+        settings.QUERY_BUDGET_MODE = 'raise'
+        kwargs, lookup_values = lookups
+        list_url, detail_url = route_urls(
+            prefix, lookup_values[basename], **kwargs
+        )
+        for api_client in (client, admin_client):
+            if basename == 'users' and api_client is client:
+                continue
+            check_query_budget(
+                api_client, list_url, django_assert_max_num_queries
+            )
+            if lookup_values[basename] is not None:
+                check_query_budget(
+                    api_client, detail_url, django_assert_max_num_queries
+                )
+
+    def test_02_repeated_query_shape(self):
+        recorder = QueryRecorder()
+        for pk in (1, 2, 3):
+            recorder(
+                lambda *args: None,
+                f'SELECT * FROM reviews_genre WHERE id = {pk}', (), False, {}
+            )
+        recorder(lambda *args: None, 'SELECT 1', (), False, {})
+        assert recorder.repeated_shapes() == [
+            ('SELECT * FROM reviews_genre WHERE id = N', 3)
+        ], (
+            'Проверьте, что повторяющиеся запросы одной формы '
+            'определяются без учёта значений.'
+        )
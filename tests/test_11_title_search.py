@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearchAPI:
+
+    SEARCH_URL = '/api/v1/titles/search/'
+
+    def create_titles(self):
+        Title.objects.create(
+            name='Крепкий орешек', year=1988,
+            description='Полицейский против террористов'
+        )
+        Title.objects.create(
+            name='Орешек знаний', year=2001,
+            description='Сборник задач, орешек за орешком'
+        )
+        Title.objects.create(
+            name='Терминатор', year=1984, description="I'll be back"
+        )
+
+    def search(self, client, query):
+        response = client.get(self.SEARCH_URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` с параметром '
+            '`q` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranked(self, client):
+        self.create_titles()
+        assert self.search(client, 'орешек') == [
+            'Орешек знаний', 'Крепкий орешек'
+        ], (
+            'Проверьте, что поиск находит произведения по словам '
+            'названия и описания и сортирует их по релевантности.'
+        )
+        assert self.search(client, 'террорист') == ['Крепкий орешек']
+        assert self.search(client, 'back "(*') == ['Терминатор']
+
+        response = client.get(self.SEARCH_URL, {'q': 'орешек', 'cursor': ''})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Орешек знаний', 'Крепкий орешек'
+        ], (
+            'Проверьте, что курсорная пагинация поиска сохраняет '
+            'порядок по релевантности.'
+        )
+
+    def test_02_index_follows_changes(self, client):
+        self.create_titles()
+        title = Title.objects.get(name='Терминатор')
+        title.name = 'Терминатор 2'
+        title.description = 'Судный день'
+        title.save()
+        assert self.search(client, 'судный') == ['Терминатор 2']
+        assert self.search(client, 'back') == []
+        title.delete()
+        assert self.search(client, 'судный') == []
+
+    def test_03_search_rebuild(self, client):
+        self.create_titles()
+        call_command('search_rebuild')
+        assert self.search(client, 'терминатор') == ['Терминатор']
+
+    def test_04_search_without_query(self, client):
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
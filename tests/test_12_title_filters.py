@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleFiltersAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        horror = Genre.objects.create(name='Ужасы', slug='horror')
+        films = Category.objects.create(name='Фильмы', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        for name, genres, category in (
+            ('dramedy', (drama, comedy), films),
+            ('drama', (drama,), books),
+            ('comedy', (comedy,), films),
+            ('horror', (horror,), None),
+        ):
+            title = Title.objects.create(
+                name=name, year=2000, description='', category=category
+            )
+            title.genre.set(genres)
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return sorted(title['name'] for title in response.json()['results'])
+
+    @pytest.mark.parametrize('query,expected', [
+        ('genre=dr', []),
+        ('genre=drama', ['drama', 'dramedy']),
+        ('genre=drama,comedy', ['comedy', 'drama', 'dramedy']),
+        ('genre_all=drama,comedy', ['dramedy']),
+        ('genre_all=drama,horror', []),
+        ('category=films', ['comedy', 'dramedy']),
+        ('category=films,books', ['comedy', 'drama', 'dramedy']),
+        ('category=fil', []),
+        ('category=films&genre=drama', ['dramedy']),
+    ])
+    def test_01_exact_and_multi_value_filters(self, client, titles,
+                                              query, expected):
+        assert self.get_names(client, query) == expected, (
+            f'Проверьте, что фильтр `{query}` для `{self.TITLES_URL}` '
+            'сравнивает слаги точно и поддерживает несколько значений '
+            'через запятую.'
+        )
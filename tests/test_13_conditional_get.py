@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Category, Genre
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGetAPI:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def check_not_modified(self, client, url, django_assert_num_queries,
+                           queries=1):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        with django_assert_num_queries(queries):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304, выполнив '
+            'не больше одного запроса версии ресурса.'
+        )
+        assert response['ETag'] == etag
+        return etag
+
+    def test_01_title_and_reviews(self, client, admin_client, user_client,
+                                  django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for url, author_client in (
+            (self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+             admin_client),
+            (self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+             user_client),
+        ):
+            etag = self.check_not_modified(
+                client, url, django_assert_num_queries
+            )
+            assert 'Last-Modified' in client.get(url)
+
+            create_single_review(author_client, title_id, 'text', 5)
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что после добавления отзыва GET-запрос к '
+                f'`{url}` со старым `If-None-Match` возвращает 200.'
+            )
+            assert response['ETag'] != etag
+
+    def test_02_categories(self, client, admin_client,
+                           django_assert_num_queries):
+        create_titles(admin_client)
+        etag = self.check_not_modified(
+            client, self.CATEGORIES_URL, django_assert_num_queries, 0
+        )
+        admin_client.delete(f'{self.CATEGORIES_URL}books/')
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления категории GET-запрос к '
+            f'`{self.CATEGORIES_URL}` со старым `If-None-Match` '
+            'возвращает 200.'
+        )
+
+    def test_03_category_delete_changes_title(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        admin_client.delete(f'{self.CATEGORIES_URL}{categories[0]["slug"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category'] is None
+
+    @pytest.mark.parametrize('model', [Category, Genre])
+    def test_04_rename_changes_title(self, client, admin_client, model):
+        titles, categories, genres = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        slug = (categories if model is Category else genres)[0]['slug']
+        instance = model.objects.get(slug=slug)
+        instance.name = 'Новое название'
+        instance.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после переименования {model.__name__} '
+            f'GET-запрос к `{url}` со старым `If-None-Match` возвращает 200.'
+        )
+        data = response.json()
+        names = (
+            [data['category']['name']] if model is Category
+            else [genre['name'] for genre in data['genre']]
+        )
+        assert 'Новое название' in names
+
+    @pytest.mark.parametrize('model,url', [
+        (Category, '/api/v1/categories/'), (Genre, '/api/v1/genres/')
+    ])
+    def test_05_rename_changes_list(self, client, admin_client, model, url):
+        _, categories, genres = create_titles(admin_client)
+        etag = client.get(url)['ETag']
+        slug = (categories if model is Category else genres)[0]['slug']
+        instance = model.objects.get(slug=slug)
+        instance.name = 'Новое название'
+        instance.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после переименования {model.__name__} '
+            f'GET-запрос к `{url}` со старым `If-None-Match` возвращает 200.'
+        )
+        assert 'Новое название' in [
+            row['name'] for row in response.json()['results']
+        ]
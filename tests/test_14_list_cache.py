@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ListCacheAPI:
+
+    @pytest.mark.parametrize('url,model', [
+        ('/api/v1/categories/', Category),
+        ('/api/v1/genres/', Genre),
+    ])
+    def test_01_list_cached_and_invalidated(self, client, admin_client,
+                                            url, model,
+                                            django_assert_max_num_queries):
+        model.objects.create(name='Первая', slug='first')
+        expected = client.get(url).json()
+        with django_assert_max_num_queries(1):
+            response = client.get(url)
+        assert response.json() == expected, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся '
+            'из кэша без запросов к списку.'
+        )
+        assert client.get(f'{url}?search=нет').json()['count'] == 0
+
+        response = admin_client.post(
+            url, data={'name': 'Вторая', 'slug': 'second'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(url).json()['count'] == 2, (
+            f'Проверьте, что POST-запрос к `{url}` сбрасывает кэш списка.'
+        )
+
+        admin_client.delete(f'{url}first/')
+        assert client.get(url).json()['count'] == 1, (
+            f'Проверьте, что DELETE-запрос к `{url}` сбрасывает кэш списка.'
+        )
+
+        model.objects.filter(slug='second').first().save()
+        model.objects.create(name='Из админки', slug='admin')
+        assert client.get(url).json()['count'] == 2, (
+            'Проверьте, что сохранение через админку сбрасывает кэш списка.'
+        )
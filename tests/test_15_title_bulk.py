@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, GenreTitle, Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleBulkAPI:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def make_items(self, count, genres, categories):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 1990 + idx,
+                'description': 'описание',
+                'genre': [genre['slug'] for genre in genres[:idx % 3 + 1]],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client):
+        items = self.make_items(
+            4, create_genre(admin_client), create_categories(admin_client)
+        )
+        response = admin_client.post(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert data['errors'] == []
+        assert [title['name'] for title in data['created']] == [
+            item['name'] for item in items
+        ]
+        assert [
+            sorted(genre['slug'] for genre in title['genre'])
+            for title in data['created']
+        ] == [sorted(item['genre']) for item in items]
+        assert GenreTitle.objects.count() == 1 + 2 + 3 + 1
+
+    def test_02_constant_queries(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        counts = []
+        for size in (2, 20):
+            items = self.make_items(size, genres, categories)
+            with CaptureQueriesContext(connection) as context:
+                admin_client.post(self.BULK_URL, items, format='json')
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            f'Проверьте, что число SQL-запросов к `{self.BULK_URL}` '
+            'не зависит от количества произведений.'
+        )
+
+    def test_03_partial_and_atomic(self, admin_client):
+        items = self.make_items(
+            3, create_genre(admin_client), create_categories(admin_client)
+        )
+        items[1]['genre'] = ['unknown']
+        response = admin_client.post(
+            f'{self.BULK_URL}?atomic=true', items, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Title.objects.count() == 0, (
+            'Проверьте, что при `atomic=true` ошибка в одном элементе '
+            'отменяет создание всех произведений.'
+        )
+
+        response = admin_client.post(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert len(data['created']) == 2
+        assert [error['index'] for error in data['errors']] == [1], (
+            'Проверьте, что ошибки массового создания возвращаются '
+            'с индексами элементов, а корректные элементы сохраняются.'
+        )
+
+    def test_04_bulk_permissions(self, client, user_client):
+        for api_client in (client, user_client):
+            response = api_client.post(
+                self.BULK_URL, '[]', content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            )
+
+    def test_05_pending_category(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            deletion_pending=True
+        )
+        item = self.make_items(1, genres, categories)[0]
+        response = admin_client.post('/api/v1/titles/', item, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(self.BULK_URL, [item], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что массовое создание не принимает категорию, '
+            'ожидающую удаления.'
+        )
+        assert not Title.objects.exists()
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SparseFieldsetsAPI:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_reviews(admin_client, {})
+        full, full_queries = self.get(client, self.TITLES_URL)
+        data, queries = self.get(client, f'{self.TITLES_URL}?fields=id,name')
+        assert [set(title) for title in data['results']] == [
+            {'id', 'name'}
+        ] * len(full['results']), (
+            f'Проверьте, что `{self.TITLES_URL}?fields=` возвращает только '
+            'перечисленные поля.'
+        )
+        assert len(queries) < len(full_queries), (
+            'Проверьте, что при `?fields=` без `genre` жанры не '
+            'загружаются отдельным запросом.'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что колонки невыбранных полей не загружаются.'
+        )
+        assert not any('reviews_category' in sql for sql in queries)
+
+        data, _ = self.get(
+            client, f'{self.TITLES_URL}?omit=description,genre,category'
+        )
+        assert set(data['results'][0]) == {'id', 'name', 'year', 'rating'}
+
+    def test_02_reviews_omit(self, client, admin_client, user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data, queries = self.get(client, f'{url}?omit=text,author')
+        assert set(data['results'][0]) == {'id', 'score', 'pub_date'}
+        assert not any('reviews_user' in sql for sql in queries), (
+            'Проверьте, что при `?omit=author` авторы отзывов '
+            'не загружаются.'
+        )
+
+    def test_03_writes_ignore_fields(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug',
+            data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.json() == {'name': 'Фильм', 'slug': 'films'}
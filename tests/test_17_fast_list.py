@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17FastListAPI:
+
+    URLS = (
+        '/api/v1/titles/',
+        '/api/v1/titles/?ordering=-rating',
+        '/api/v1/titles/?genre=comedy,drama&cursor=',
+        '/api/v1/titles/?page=2',
+        '/api/v1/categories/',
+        '/api/v1/genres/?search=Ко',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/?cursor=',
+    )
+
+    def get_content(self, client, settings, url, fast):
+        settings.FAST_LIST_PATH = fast
+        cache.clear()
+        response = client.get(url)
+        assert response.status_code == 200
+        return response.content
+
+    def test_01_fast_path_matches_serializers(self, client, settings,
+                                              admin_client, admin,
+                                              user_client, user,
+                                              moderator_client, moderator):
+        _, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        for idx in range(5):
+            Title.objects.create(
+                name=f'Без жанров {idx}', year=2000, description=''
+            )
+        admin_client.delete('/api/v1/categories/books/')
+        for url in self.URLS:
+            url = url.format(title_id=titles[0]['id'])
+            assert (
+                self.get_content(client, settings, url, True)
+                == self.get_content(client, settings, url, False)
+            ), (
+                f'Проверьте, что быстрый путь `{url}` возвращает тот же '
+                'JSON, что и сериализаторы.'
+            )
+
+    def test_02_fast_path_skips_serializers(self, client, settings,
+                                            admin_client, monkeypatch):
+        create_reviews(admin_client, {})
+        settings.FAST_LIST_PATH = True
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Сериализатор не должен использоваться.')
+
+        monkeypatch.setattr(
+            'api.serializers.TitleReadSerializer.to_representation', fail
+        )
+        assert client.get('/api/v1/titles/').status_code == 200
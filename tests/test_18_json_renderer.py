@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+
+class Test18FastJSON:
+
+    DATA = {
+        'name': 'Произведение \u2028\u2029 "кавычки" \\ \n',
+        'pub_date': datetime(2021, 5, 1, 10, 30, 5, 123456, timezone.utc),
+        'date': datetime(2021, 5, 1).date(),
+        'price': Decimal('1.50'),
+        'lazy': lazy(lambda: 'ленивая строка', str)(),
+        'nested': [{'id': 1, 'rating': None, 'ok': True}, 1.5, (2, 3)],
+        1: 'числовой ключ',
+    }
+
+    def test_01_render_matches_json_renderer(self):
+        assert (
+            FastJSONRenderer().render(self.DATA)
+            == JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что FastJSONRenderer отдаёт те же байты, '
+            'что и JSONRenderer'
+        )
+        assert FastJSONRenderer().render(None) == b'', (
+            'Проверьте, что None рендерится в пустой ответ'
+        )
+
+    def test_02_render_with_indent_falls_back(self):
+        content = FastJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=4'
+        )
+        assert content == b'{\n    "a": 1\n}', (
+            'Проверьте, что с indent используется JSONRenderer'
+        )
+
+    def test_03_parse(self):
+        content = JSONRenderer().render(self.DATA)
+        assert (
+            FastJSONParser().parse(BytesIO(content))
+            == JSONParser().parse(BytesIO(content))
+        ), 'Проверьте, что FastJSONParser разбирает JSON как JSONParser'
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a": '))
+
+    def test_04_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert (
+            FastJSONRenderer().render(self.DATA)
+            == JSONRenderer().render(self.DATA)
+        ), 'Проверьте, что без orjson используется JSONRenderer'
+        assert FastJSONParser().parse(BytesIO(b'{"a": 1}')) == {'a': 1}
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a": '))
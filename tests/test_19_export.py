@@ -0,0 +1,72 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from api.export import export_titles
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ExportAPI:
+
+    URL = '/api/v1/export/titles.ndjson'
+
+    def test_01_export_permissions(self, client, user_client,
+                                   moderator_client):
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.URL}` возвращает ответ со статусом 401.'
+        )
+        for role_client in (user_client, moderator_client):
+            assert (
+                role_client.get(self.URL).status_code == HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что выгрузка `{self.URL}` доступна только '
+                'администратору.'
+            )
+
+    def test_02_export_titles(self, admin_client, admin, user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся через StreamingHttpResponse.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).splitlines()
+        exported = [json.loads(line) for line in lines]
+        assert [title['id'] for title in exported] == sorted(
+            title['id'] for title in titles
+        ), 'Проверьте, что в выгрузке все произведения, по одному на строку.'
+        assert len(exported[0]['reviews']) == len(reviews), (
+            'Проверьте, что в выгрузке есть отзывы произведения.'
+        )
+        for title in exported:
+            title_reviews = title.pop('reviews')
+            assert title == admin_client.get(
+                f'/api/v1/titles/{title["id"]}/'
+            ).json(), (
+                'Проверьте, что произведение в выгрузке совпадает '
+                'с `/api/v1/titles/{title_id}/`.'
+            )
+            expected = admin_client.get(
+                f'/api/v1/titles/{title["id"]}/reviews/'
+            ).json()['results']
+            assert title_reviews == expected, (
+                'Проверьте, что в выгрузке есть все отзывы произведения.'
+            )
+
+    def test_03_export_chunks(self, django_assert_num_queries):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, description='')
+            for idx in range(5)
+        )
+        with django_assert_num_queries(1 + 3 * 2):
+            lines = list(export_titles(chunk_size=2))
+        assert len(lines) == 5, (
+            'Проверьте, что выгрузка читает произведения пачками '
+            'и делает по два запроса на пачку.'
+        )
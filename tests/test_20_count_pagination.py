@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+def get_with_queries(client, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, data)
+    assert response.status_code == HTTPStatus.OK, (
+        f'GET-запрос к `{url}` должен возвращать ответ со статусом 200.'
+    )
+    count_queries = [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    return response.json(), count_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CountPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    SEARCH_URL = '/api/v1/titles/search/'
+
+    def test_01_countless_search(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Орешек {idx}', year=2000, description='')
+            for idx in range(7)
+        )
+        data, count_queries = get_with_queries(
+            client, self.SEARCH_URL, {'q': 'орешек'}
+        )
+        assert not count_queries and 'count' not in data, (
+            f'Проверьте, что `{self.SEARCH_URL}` не выполняет COUNT.'
+        )
+        assert len(data['results']) == 5 and data['previous'] is None
+        assert data['next'], 'Проверьте ссылку на следующую страницу.'
+
+        data, count_queries = get_with_queries(client, data['next'])
+        assert len(data['results']) == 2 and data['next'] is None
+        assert data['previous'] and 'page=' not in data['previous'], (
+            'Проверьте ссылку на предыдущую страницу.'
+        )
+        response = client.get(self.SEARCH_URL, {'q': 'орешек', 'page': 3})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос пустой страницы возвращает 404.'
+        )
+
+    def test_02_cached_count(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        data, count_queries = get_with_queries(client, self.TITLES_URL)
+        assert data['count'] == 2 and len(count_queries) == 1
+        data, count_queries = get_with_queries(
+            client, self.TITLES_URL, {'page': 1}
+        )
+        assert data['count'] == 2 and not count_queries, (
+            f'Проверьте, что COUNT для `{self.TITLES_URL}` кэшируется '
+            'и не зависит от номера страницы.'
+        )
+        data, count_queries = get_with_queries(
+            client, self.TITLES_URL, {'genre': genres[2]['slug']}
+        )
+        assert data['count'] == 1 and len(count_queries) == 1, (
+            'Проверьте, что COUNT кэшируется отдельно для каждого фильтра.'
+        )
+
+    def test_03_cached_count_invalidation(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        params = {'genre': genres[2]['slug']}
+        assert client.get(self.TITLES_URL, params).json()['count'] == 1
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'genre': [genres[2]['slug']]}, format='json'
+        )
+        assert client.get(self.TITLES_URL, params).json()['count'] == 2, (
+            'Проверьте, что изменение жанров произведения сбрасывает '
+            'закэшированный COUNT.'
+        )
+        response = admin_client.post(f'{self.TITLES_URL}bulk/', [{
+            'name': 'Новое', 'year': 2000, 'description': 'описание',
+            'genre': [genres[2]['slug']], 'category': categories[0]['slug']
+        }], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(self.TITLES_URL, params).json()['count'] == 3, (
+            'Проверьте, что массовое создание сбрасывает закэшированный '
+            'COUNT.'
+        )
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert client.get(self.TITLES_URL, params).json()['count'] == 0, (
+            'Проверьте, что удаление жанра сбрасывает закэшированный COUNT.'
+        )
+        admin_client.delete(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert client.get(self.TITLES_URL).json()['count'] == 2, (
+            'Проверьте, что удаление произведения сбрасывает '
+            'закэшированный COUNT.'
+        )
@@ -0,0 +1,107 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from api.metrics import (METRICS_CACHE, PAGE_SIZE_KEY, flush_executor,
+                         get_page_size_stats, page_size_counter)
+from reviews.models import Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21PageSize:
+
+    def get_results(self, client, url, page_size=None):
+        params = {} if page_size is None else {'page_size': page_size}
+        response = client.get(url, params)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `page_size` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()['results']
+
+    def test_01_page_size_caps(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, description='')
+            for idx in range(105)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(120)
+        )
+        url = '/api/v1/titles/'
+        assert len(self.get_results(client, url)) == 5
+        assert len(self.get_results(client, url, 20)) == 20, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы.'
+        )
+        assert len(self.get_results(client, url, 1000)) == 100, (
+            'Проверьте, что размер страницы произведений ограничен 100.'
+        )
+        assert len(self.get_results(client, url, 'abc')) == 5, (
+            'Проверьте, что при некорректном `page_size` используется '
+            'размер страницы по умолчанию.'
+        )
+        assert len(self.get_results(client, f'{url}?cursor=', 30)) == 30
+        assert len(
+            self.get_results(client, '/api/v1/genres/', 150)
+        ) == 120, (
+            'Проверьте, что для жанров разрешены страницы больше 100.'
+        )
+
+    def test_02_page_size_metrics(self, client):
+        url = '/api/v1/titles/'
+        for page_size in (None, 7, 8, 300, 0):
+            self.get_results(client, url, page_size)
+        stats = get_page_size_stats('TitleViewSet')
+        assert stats['default'] == 1 and stats['10'] == 2, (
+            'Проверьте, что запрошенные размеры страниц учитываются '
+            'по корзинам.'
+        )
+        assert stats['500'] == 1 and stats['capped'] == 1
+        assert stats['invalid'] == 1
+        out = StringIO()
+        call_command('page_size_stats', stdout=out)
+        lines = {
+            line.split()[0]: line.split()[1:]
+            for line in out.getvalue().splitlines()
+        }
+        labels = lines['viewset']
+        assert dict(zip(labels, map(int, lines['TitleViewSet']))) == stats, (
+            'Проверьте, что команда `page_size_stats` выводит счётчики '
+            'из общего хранилища.'
+        )
+
+    def test_03_shared_storage(self, client, settings):
+        key = PAGE_SIZE_KEY.format(view='TitleViewSet', bucket='10')
+        metrics = caches[METRICS_CACHE]
+        self.get_results(client, '/api/v1/titles/', 7)
+        assert metrics.get(key) is None, (
+            'Проверьте, что запрос не пишет счётчики в общий кэш сразу.'
+        )
+        page_size_counter.flush()
+        cache.clear()
+        assert metrics.get(key) == 1, (
+            'Проверьте, что счётчики выгружаются в общий кэш `metrics`, '
+            'а не в кэш ответов.'
+        )
+        settings.PAGE_SIZE_STATS_FLUSH_INTERVAL = 0
+        self.get_results(client, '/api/v1/titles/', 7)
+        flush_executor.submit(lambda: None).result()
+        assert metrics.get(key) == 2, (
+            'Проверьте, что счётчики выгружаются фоновым потоком '
+            'раз в `PAGE_SIZE_STATS_FLUSH_INTERVAL` секунд.'
+        )
+
+    def test_04_cached_responses_counted(self, client):
+        url = '/api/v1/genres/'
+        self.get_results(client, url, 7)
+        self.get_results(client, url, 7)
+        etag = client.get(url, {'page_size': 7})['ETag']
+        response = client.get(
+            url, {'page_size': 7}, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 304
+        assert get_page_size_stats('GenreViewSet')['10'] == 4, (
+            'Проверьте, что размер страницы учитывается и для ответов '
+            'из кэша списка и 304.'
+        )
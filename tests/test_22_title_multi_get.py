@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import resolve
+from api.query_budget import get_view_budget
+from reviews.constants import TITLE_MULTI_GET_MAX_SIZE
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleMultiGet:
+
+    URL = '/api/v1/titles/bulk/'
+
+    def test_01_multi_get(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        ids = [titles[1]['id'], 999, titles[0]['id'], titles[1]['id']]
+        response = client.get(self.URL, {'ids': ','.join(map(str, ids))})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.URL}?ids=` возвращает '
+            'ответ со статусом 200.'
+        )
+        data = response.json()
+        expected = [
+            client.get(f'/api/v1/titles/{pk}/').json()
+            for pk in (titles[1]['id'], titles[0]['id'])
+        ]
+        assert data['results'] == expected, (
+            'Проверьте, что произведения возвращаются в порядке запроса '
+            'с рейтингом, жанрами и категорией.'
+        )
+        assert data['missing'] == [999], (
+            'Проверьте, что отсутствующие id возвращаются в `missing`.'
+        )
+
+    def test_02_multi_get_query_budget(self, client, admin_client,
+                                       django_assert_max_num_queries):
+        _, titles = create_reviews(admin_client, {})
+        budget = get_view_budget(resolve(self.URL).func, 'GET')
+        assert budget is not None, (
+            f'Не задан бюджет SQL-запросов для GET-запроса к `{self.URL}`.'
+        )
+        ids = ','.join(
+            str(pk) for pk in [title['id'] for title in titles]
+            + list(range(10 ** 6, 10 ** 6 + 50))
+        )
+        with django_assert_max_num_queries(budget):
+            response = client.get(self.URL, {'ids': ids})
+        assert len(response.json()['results']) == 2
+
+    @pytest.mark.parametrize('ids', (
+        '', 'a,b', ','.join(map(str, range(TITLE_MULTI_GET_MAX_SIZE + 1)))
+    ))
+    def test_03_multi_get_invalid(self, client, ids):
+        response = client.get(self.URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пустой, некорректный или слишком длинный '
+            'список id возвращает ответ со статусом 400.'
+        )
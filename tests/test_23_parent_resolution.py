@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_comments
+
+
+def parent_selects(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ParentResolution:
+
+    def test_01_title_resolved_once(self, admin_client, admin, user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        requests = (
+            ('get', url, None),
+            ('get', f'{url}{reviews[0]["id"]}/', None),
+            ('post', url, {'text': 'Отзыв', 'score': 7}),
+            ('patch', f'{url}{reviews[0]["id"]}/', {'score': 3}),
+        )
+        for method, request_url, data in requests:
+            client = user_client if method == 'post' else admin_client
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, method)(
+                    request_url, data, format='json'
+                )
+            assert response.status_code < 300
+            assert len(parent_selects(context, 'reviews_title')) == 1, (
+                f'Проверьте, что {method.upper()}-запрос к `{request_url}` '
+                'читает произведение один раз.'
+            )
+
+    def test_02_review_chain_single_query(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        for method, request_url, data in (
+            ('get', url, None),
+            ('post', url, {'text': 'Комментарий'}),
+            ('patch', f'{url}{comments[0]["id"]}/', {'text': 'Новый'}),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(admin_client, method)(
+                    request_url, data, format='json'
+                )
+            assert response.status_code < 300
+            selects = parent_selects(context, 'reviews_review')
+            assert len(selects) == 1 and 'reviews_title' in selects[0], (
+                f'Проверьте, что {method.upper()}-запрос к `{request_url}` '
+                'читает отзыв вместе с произведением одним запросом.'
+            )
+            assert not parent_selects(context, 'reviews_title')
+
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв другого произведения возвращает 404.'
+        )
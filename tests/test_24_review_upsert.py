@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReviewUpsert:
+
+    def get_rating(self, title_id):
+        return Title.objects.with_rating().values_list(
+            'rating', 'review_count'
+        ).get(pk=title_id)
+
+    def test_01_duplicate_review_by_constraint(self, admin_client,
+                                               user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 5}
+        assert user_client.post(url, data).status_code == HTTPStatus.CREATED
+        response = user_client.post(url, data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв на это произведение.']
+        }
+        assert self.get_rating(titles[0]['id']) == (5, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг.'
+        )
+
+    def test_02_upsert_review(self, admin_client, user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/me/'
+        response = user_client.put(url, {'text': 'Первый', 'score': 4})
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что PUT-запрос к `{url}` без своего отзыва '
+            'создаёт его и возвращает ответ со статусом 201.'
+        )
+        review_id = response.json()['id']
+        assert self.get_rating(titles[0]['id']) == (4, 1)
+
+        response = user_client.put(url, {'text': 'Второй', 'score': 8})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный PUT-запрос к `{url}` заменяет отзыв '
+            'и возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['id'] == review_id and data['text'] == 'Второй'
+        assert data['author'] == user.username and data['score'] == 8
+        assert Review.objects.filter(title_id=titles[0]['id']).count() == 1
+        assert self.get_rating(titles[0]['id']) == (8, 1), (
+            'Проверьте, что замена отзыва пересчитывает рейтинг.'
+        )
+
+    def test_03_upsert_validation(self, admin_client, client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/me/'
+        assert client.put(url, {'text': 'Отзыв', 'score': 4}).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.put(url, {'score': 4}).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что для замены отзыва нужны текст и оценка.'
+        assert user_client.put(
+            '/api/v1/titles/999999/reviews/me/', {'text': 'a', 'score': 4}
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert self.get_rating(titles[0]['id']) == (None, 0)
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from reviews.constants import REVIEW_LATEST_COMMENTS
+from reviews.counters import rebuild_counters
+from reviews.models import Comment, Review, User
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReviewIncludeComments:
+
+    def create_comments(self, reviews, author, count):
+        now = timezone.now()
+        Comment.objects.bulk_create(
+            Comment(
+                review_id=reviews[0]['id'], author=author,
+                text=f'Комментарий {idx}', pub_date=now
+            )
+            for idx in range(count)
+        )
+        rebuild_counters()
+        return list(
+            Comment.objects.filter(review_id=reviews[0]['id'])
+            .order_by('pub_date', 'pk').values_list('text', flat=True)
+        )
+
+    def test_01_include_comments(self, client, admin_client, admin,
+                                 user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        texts = self.create_comments(reviews, user, 5)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for request_client in (client, admin_client):
+            response = request_client.get(url, {'include': 'comments'})
+            assert response.status_code == HTTPStatus.OK
+            results = {
+                review['id']: review for review in response.json()['results']
+            }
+            review = results[reviews[0]['id']]
+            assert review['comment_count'] == 5, (
+                'Проверьте, что с `?include=comments` отзыв содержит '
+                '`comment_count`.'
+            )
+            assert [comment['text'] for comment in review['comments']] == (
+                texts[-REVIEW_LATEST_COMMENTS:]
+            ), (
+                'Проверьте, что с `?include=comments` отзыв содержит '
+                'последние комментарии.'
+            )
+            assert review['comments'][0]['author'] == user.username
+            other = results[reviews[1]['id']]
+            assert other['comment_count'] == 0 and other['comments'] == []
+
+        review = client.get(
+            f'{url}{reviews[0]["id"]}/', {'include': 'comments'}
+        ).json()
+        assert review['comment_count'] == 5
+        assert 'comment_count' not in client.get(url).json()['results'][0], (
+            'Проверьте, что без `?include=comments` ответ не меняется.'
+        )
+
+    def test_02_include_comments_queries(self, client, admin_client, admin,
+                                         django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        for idx in range(6):
+            author = User.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            review = Review.objects.create(
+                title_id=titles[0]['id'], author=author, text='', score=1
+            )
+            self.create_comments([{'id': review.pk}], author, 4)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_num_queries(4):
+            response = client.get(
+                url, {'include': 'comments', 'page_size': 50}
+            )
+        assert len(response.json()['results']) == 7, (
+            'Проверьте, что комментарии всех отзывов страницы читаются '
+            'постоянным числом запросов.'
+        )
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from tests.utils import check_query_budget, create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthorFeeds:
+
+    def create_activity(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = user_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            {'text': 'Второй отзыв', 'score': 2}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        return comments, reviews, titles, response.json()
+
+    def test_01_my_feeds(self, admin_client, admin, user_client, user,
+                         client, django_assert_max_num_queries):
+        comments, reviews, titles, second = self.create_activity(
+            admin_client, admin, user_client, user
+        )
+        url = '/api/v1/users/me/reviews/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        data = user_client.get(url).json()
+        assert data['count'] == 2, (
+            f'Проверьте, что `{url}` возвращает только отзывы пользователя.'
+        )
+        assert [
+            (review['id'], review['title']) for review in data['results']
+        ] == [
+            (reviews[1]['id'], titles[0]['id']), (second['id'], titles[1]['id'])
+        ], (
+            f'Проверьте, что `{url}` отсортирован по дате публикации '
+            'и содержит id произведения.'
+        )
+        assert data['results'][0]['author'] == user.username
+
+        url = '/api/v1/users/me/comments/'
+        data = user_client.get(url).json()
+        assert [
+            (comment['id'], comment['review'], comment['title'])
+            for comment in data['results']
+        ] == [(comments[1]['id'], reviews[0]['id'], titles[0]['id'])], (
+            f'Проверьте, что `{url}` возвращает комментарии пользователя '
+            'с id отзыва и произведения.'
+        )
+        for url in ('/api/v1/users/me/reviews/', url):
+            check_query_budget(user_client, url, django_assert_max_num_queries)
+
+    def test_02_user_feeds_for_admin(self, admin_client, admin, user_client,
+                                     user, django_assert_max_num_queries):
+        self.create_activity(admin_client, admin, user_client, user)
+        url = f'/api/v1/users/{user.username}/reviews/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        data = admin_client.get(url).json()
+        assert data['count'] == 2
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/comments/'
+        ).json()['count'] == 1
+        assert admin_client.get(
+            '/api/v1/users/unknown/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        response = admin_client.get(url, {'cursor': '', 'page_size': 1})
+        next_page = admin_client.get(response.json()['next']).json()
+        assert [review['id'] for review in next_page['results']] == [
+            data['results'][1]['id']
+        ], 'Проверьте курсорную пагинацию ленты автора.'
+        check_query_budget(admin_client, url, django_assert_max_num_queries)
+
+    def test_03_user_ordering_ignored(self, admin_client, admin, user_client,
+                                      user):
+        _, _, _, second = self.create_activity(
+            admin_client, admin, user_client, user
+        )
+        urls = (
+            '/api/v1/users/me/reviews/', '/api/v1/users/me/comments/',
+            f'/api/v1/users/{user.username}/reviews/',
+            f'/api/v1/users/{user.username}/comments/',
+        )
+        for url in urls:
+            client = user_client if '/me/' in url else admin_client
+            for ordering in ('username', '-review_count'):
+                response = client.get(
+                    url, {'cursor': '', 'ordering': ordering}
+                )
+                assert response.status_code == HTTPStatus.OK, (
+                    f'Проверьте, что `{url}` не применяет `?ordering=` '
+                    'списка пользователей.'
+                )
+        data = user_client.get(
+            '/api/v1/users/me/reviews/',
+            {'cursor': '', 'ordering': '-review_count'}
+        ).json()
+        assert data['results'][-1]['id'] == second['id']
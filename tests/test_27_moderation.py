@@ -0,0 +1,138 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from api import jobs
+from reviews.models import Comment, Review, Title, User
+
+
+def stored_ratings():
+    return list(Title.objects.order_by('pk').values_list(
+        'score_sum', 'review_count', 'score_histogram'
+    ))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Moderation:
+
+    REVIEWS_URL = '/api/v1/moderation/reviews/'
+    COMMENTS_URL = '/api/v1/moderation/comments/'
+
+    def create_spam(self, spammer, count):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, description='')
+            for idx in range(3)
+        )
+        titles = list(Title.objects.order_by('pk'))
+        other = User.objects.create(username='other', email='o@yamdb.fake')
+        reviews = []
+        for idx, title in enumerate(titles):
+            for author, score in ((spammer, 1 + idx), (other, 10)):
+                review = Review.objects.create(
+                    title=title, author=author, text='', score=score
+                )
+                Title.objects.filter(pk=title.pk).change_scores(added=score)
+                reviews.append(review)
+        for review in reviews:
+            Comment.objects.bulk_create(
+                Comment(review=review, author=spammer, text='спам')
+                for _ in range(count)
+            )
+        call_command('counters_rebuild')
+        return titles, reviews
+
+    def test_01_permissions(self, client, user_client, moderator_client):
+        for url in (self.REVIEWS_URL, self.COMMENTS_URL):
+            assert client.post(
+                url, {'ids': [1]}, format='json'
+            ).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.post(
+                url, {'ids': [1]}, format='json'
+            ).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{url}` недоступен обычному пользователю.'
+            )
+            assert moderator_client.post(
+                url, {'ids': [1]}, format='json'
+            ).status_code == HTTPStatus.OK
+
+    def test_02_delete_reviews(self, moderator_client, user):
+        titles, reviews = self.create_spam(user, 2)
+        response = moderator_client.post(self.REVIEWS_URL, {
+            'ids': [reviews[0].pk, reviews[3].pk, 999999]
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'reviews': 2, 'comments': 4, 'titles': 2
+        }, (
+            'Проверьте, что ответ содержит число удалённых отзывов, '
+            'комментариев и затронутых произведений.'
+        )
+        assert not Review.objects.filter(
+            pk__in=[reviews[0].pk, reviews[3].pk]
+        ).exists()
+        ratings = stored_ratings()
+        call_command('ratings_rebuild')
+        assert ratings == stored_ratings(), (
+            'Проверьте, что массовое удаление отзывов пересчитывает '
+            'хранимые рейтинги.'
+        )
+
+    def test_03_delete_by_author_and_period(self, admin_client, user):
+        titles, reviews = self.create_spam(user, 1)
+        Review.objects.filter(pk=reviews[0].pk).update(
+            pub_date=timezone.now() - timedelta(days=2)
+        )
+        response = admin_client.post(self.REVIEWS_URL, {
+            'author': user.username,
+            'since': (timezone.now() - timedelta(days=1)).isoformat(),
+        }, format='json')
+        assert response.json()['reviews'] == 2, (
+            'Проверьте удаление отзывов автора за период.'
+        )
+        assert list(Review.objects.filter(author=user)) == [reviews[0]]
+        ratings = stored_ratings()
+        call_command('ratings_rebuild')
+        assert ratings == stored_ratings()
+
+        response = admin_client.post(
+            self.COMMENTS_URL, {'author': user.username}, format='json'
+        )
+        assert response.json() == {'comments': 4}
+        assert not Comment.objects.exists()
+
+    @pytest.mark.parametrize('data', (
+        {}, {'ids': []}, {'ids': ['a']}, {'author': 'unknown'},
+        {'ids': [1], 'author': 'user'},
+        {'ids': [1], 'since': '2020-01-01T00:00:00Z'},
+        {'author': 'user', 'since': '2021-01-01T00:00:00Z',
+         'until': '2020-01-01T00:00:00Z'},
+    ))
+    def test_04_invalid_data(self, admin_client, user, data):
+        response = admin_client.post(self.COMMENTS_URL, data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный выбор записей возвращает 400.'
+        )
+
+    def test_05_background_job(self, moderator_client, user, settings):
+        settings.MODERATION_SYNC_LIMIT = 2
+        self.create_spam(user, 1)
+        response = moderator_client.post(
+            self.COMMENTS_URL, {'author': user.username}, format='json'
+        )
+        assert response.status_code == HTTPStatus.ACCEPTED, (
+            'Проверьте, что большие задачи модерации выполняются в фоне '
+            'и возвращают ответ со статусом 202.'
+        )
+        job_id = response.json()['id']
+        jobs.executor.submit(lambda: None).result()
+        response = moderator_client.get(
+            f'/api/v1/moderation/jobs/{job_id}/'
+        )
+        assert response.json() == {
+            'id': job_id, 'status': 'done', 'result': {'comments': 6}
+        }, 'Проверьте состояние фоновой задачи модерации.'
+        assert moderator_client.get(
+            '/api/v1/moderation/jobs/unknown/'
+        ).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,177 @@
+from contextlib import contextmanager
+from http import HTTPStatus
+from threading import Event
+
+import pytest
+from django.core.management import call_command
+from api import jobs
+from api.cache import get_list_cache_version
+from reviews.deletion import mark_for_deletion
+from reviews.models import Category, Comment, Review, Title, User
+from tests.utils import create_comments
+
+
+@contextmanager
+def paused_jobs():
+    """Фоновые задачи ждут выхода из блока, затем выполняются."""
+    release = Event()
+    jobs.executor.submit(release.wait)
+    try:
+        yield
+    finally:
+        release.set()
+        jobs.executor.submit(lambda: None).result()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28CascadeDeletion:
+
+    def create_data(self, admin_client, admin, user_client, user):
+        return create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+
+    def test_01_small_cascade_inline(self, admin_client, admin,
+                                     user_client, user):
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        response = admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Title.objects.filter(pk=titles[0]['id']).exists()
+        assert not Review.objects.exists() and not Comment.objects.exists()
+
+    def test_02_title_background(self, admin_client, admin, user_client,
+                                 user, client, settings):
+        settings.DELETION_SYNC_LIMIT = 0
+        _, reviews, titles = self.create_data(
+            admin_client, admin, user_client, user
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        with paused_jobs():
+            response = admin_client.delete(title_url)
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            assert Title.objects.filter(pk=titles[0]['id']).exists()
+            urls = (
+                title_url, f'{title_url}reviews/',
+                f'{title_url}reviews/{reviews[0]["id"]}/comments/',
+            )
+            for url in urls:
+                assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что `{url}` скрыт сразу после удаления '
+                    'произведения.'
+                )
+            assert [
+                title['id'] for title in
+                client.get('/api/v1/titles/').json()['results']
+            ] == [titles[1]['id']]
+        assert not Title.objects.filter(pk=titles[0]['id']).exists(), (
+            'Проверьте, что фоновая задача удаляет произведение.'
+        )
+        assert not Review.objects.exists() and not Comment.objects.exists()
+
+    def test_03_user_background(self, admin_client, admin, user_client,
+                                user, settings):
+        settings.DELETION_SYNC_LIMIT = 0
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        with paused_jobs():
+            response = admin_client.delete(f'/api/v1/users/{user.username}/')
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            assert admin_client.get(
+                f'/api/v1/users/{user.username}/'
+            ).status_code == HTTPStatus.NOT_FOUND
+            assert user_client.get('/api/v1/users/me/').status_code == (
+                HTTPStatus.UNAUTHORIZED
+            ), 'Проверьте, что удаляемый пользователь не может войти.'
+        assert not User.objects.filter(pk=user.pk).exists()
+        assert not Review.objects.filter(author=user).exists()
+        title = Title.objects.with_rating().get(pk=titles[0]['id'])
+        assert (title.review_count, title.rating) == (1, 5), (
+            'Проверьте, что удаление пользователя пересчитывает рейтинги.'
+        )
+
+    def test_04_category_background(self, admin_client, admin, user_client,
+                                    user, client, settings):
+        settings.DELETION_SYNC_LIMIT = 0
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        slug = titles[0]['category']
+        version = get_list_cache_version(Title)
+        with paused_jobs():
+            response = admin_client.delete(f'/api/v1/categories/{slug}/')
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            assert slug not in [
+                category['slug'] for category in
+                client.get('/api/v1/categories/').json()['results']
+            ], 'Проверьте, что категория скрыта сразу после удаления.'
+            marked_version = get_list_cache_version(Title)
+            assert marked_version != version, (
+                'Проверьте, что пометка категории к удалению сбрасывает '
+                'кэш списков произведений.'
+            )
+        assert not Category.objects.filter(slug=slug).exists()
+        assert get_list_cache_version(Title) != marked_version, (
+            'Проверьте, что удаление категории сбрасывает кэш списков '
+            'произведений.'
+        )
+        assert client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        ).json()['category'] is None
+
+    def test_05_resume(self, admin_client, admin, user_client, user):
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        mark_for_deletion(Title.objects.get(pk=titles[0]['id']))
+        call_command('deletions_resume')
+        assert not Title.objects.filter(pk=titles[0]['id']).exists(), (
+            'Проверьте, что deletions_resume удаляет помеченные строки.'
+        )
+        assert Title.objects.filter(pk=titles[1]['id']).exists()
+
+    def test_06_pending_rows_hidden(self, admin_client, admin, user_client,
+                                    user, client):
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        mark_for_deletion(Title.objects.get(pk=titles[0]['id']))
+        url = f'/api/v1/titles/{titles[0]["id"]}/scores/'
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что `{url}` скрыт для удаляемого произведения.'
+        )
+        for url in ('/api/v1/users/me/reviews/', '/api/v1/users/me/comments/'):
+            assert user_client.get(url).json()['count'] == 0, (
+                f'Проверьте, что `{url}` не содержит записей удаляемого '
+                'произведения.'
+            )
+
+        category = Category.objects.get(slug=titles[1]['category'])
+        mark_for_deletion(category)
+        title_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        assert client.get(title_url).json()['category'] is None
+        for list_client in (client, admin_client):
+            results = list_client.get('/api/v1/titles/').json()['results']
+            assert [title['category'] for title in results] == [None], (
+                'Проверьте, что удаляемая категория не показывается '
+                'в произведениях.'
+            )
+        response = client.get('/api/v1/titles/', {'category': category.slug})
+        assert response.json()['results'] == [], (
+            'Проверьте, что фильтр `category` не находит удаляемую категорию.'
+        )
+
+    @pytest.mark.parametrize('model', [Title, User])
+    def test_07_comments_in_cascade_size(self, admin_client, admin,
+                                         user_client, user, settings,
+                                         user_superuser_client, model):
+        settings.DELETION_SYNC_LIMIT = 3
+        _, _, titles = self.create_data(admin_client, admin, user_client, user)
+        client, url, pk = (
+            (admin_client, f'/api/v1/titles/{titles[0]["id"]}/',
+             titles[0]['id']) if model is Title else
+            (user_superuser_client, f'/api/v1/users/{admin.username}/',
+             admin.pk)
+        )
+        with paused_jobs():
+            response = client.delete(url)
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            assert model.objects.filter(
+                pk=pk, deletion_pending=True
+            ).exists(), (
+                f'Проверьте, что размер каскада `{url}` учитывает '
+                'комментарии к отзывам.'
+            )
+        assert not model.objects.filter(pk=pk).exists()
@@ -0,0 +1,162 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.admin import site
+from django.core.management import call_command
+from reviews.constants import MIN_SCORE_VALUE
+from reviews.models import Comment, Review, Title, User
+from tests.utils import create_comments
+
+
+def user_counters(*users):
+    return {
+        username: (review_count, comment_count)
+        for username, review_count, comment_count in User.objects.filter(
+            pk__in=[user.pk for user in users]
+        ).values_list('username', 'review_count', 'comment_count')
+    }
+
+
+def title_scores(title_id):
+    score_sum, review_count, histogram = Title.objects.values_list(
+        'score_sum', 'review_count', 'score_histogram'
+    ).get(pk=title_id)
+    return score_sum, review_count, {
+        score: count
+        for score, count in enumerate(histogram, MIN_SCORE_VALUE) if count
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Counters:
+
+    def test_01_create_and_delete(self, admin_client, admin, user_client,
+                                  user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        assert user_counters(admin, user) == {
+            admin.username: (1, 1), user.username: (1, 1)
+        }, (
+            'Проверьте, что создание отзывов и комментариев увеличивает '
+            'счётчики авторов.'
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.comment_count == 2, (
+            'Проверьте, что создание комментария увеличивает '
+            '`comment_count` отзыва.'
+        )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = user_client.delete(
+            f'{url}comments/{comments[1]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        review.refresh_from_db()
+        assert review.comment_count == 1
+        assert user_counters(user) == {user.username: (1, 0)}, (
+            'Проверьте, что удаление комментария уменьшает счётчик автора.'
+        )
+
+        assert admin_client.delete(url).status_code == HTTPStatus.NO_CONTENT
+        assert user_counters(admin, user) == {
+            admin.username: (0, 0), user.username: (1, 0)
+        }, (
+            'Проверьте, что удаление отзыва уменьшает счётчики авторов '
+            'отзыва и его комментариев.'
+        )
+
+    def test_02_include_and_ordering(self, admin_client, admin, user_client,
+                                     user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        user_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            {'text': 'Второй отзыв', 'score': 2}
+        )
+        url = '/api/v1/users/'
+        data = admin_client.get(url, {'ordering': 'username'}).json()
+        assert 'review_count' not in data['results'][0], (
+            'Проверьте, что без `?include=counts` ответ не меняется.'
+        )
+        data = admin_client.get(
+            url, {'include': 'counts', 'ordering': '-review_count'}
+        ).json()
+        first = data['results'][0]
+        assert (first['username'], first['review_count']) == (
+            user.username, 2
+        ), (
+            f'Проверьте, что `{url}` сортируется по `review_count` '
+            'и с `?include=counts` содержит счётчики.'
+        )
+        assert first['comment_count'] == 1
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = user_client.get(
+            url, {'include': 'counts', 'ordering': 'comment_count'}
+        ).json()
+        assert [
+            (review['id'], review['comment_count'])
+            for review in data['results']
+        ] == [(reviews[1]['id'], 0), (reviews[0]['id'], 2)], (
+            f'Проверьте, что `{url}` сортируется по `comment_count`.'
+        )
+        assert 'comments' not in data['results'][0]
+
+    def test_03_rebuild(self, admin_client, admin, user_client, user):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Review.objects.update(comment_count=10)
+        User.objects.update(review_count=0, comment_count=7)
+        call_command('counters_rebuild')
+        assert Review.objects.get(pk=reviews[0]['id']).comment_count == 2
+        assert Review.objects.get(pk=reviews[1]['id']).comment_count == 0
+        assert user_counters(admin, user) == {
+            admin.username: (1, 1), user.username: (1, 1)
+        }, 'Проверьте, что `counters_rebuild` пересчитывает счётчики.'
+
+    def test_04_admin(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        review_admin = site._registry[Review]
+        review = Review.objects.get(pk=reviews[1]['id'])
+        review.score = 9
+        review_admin.save_model(None, review, None, True)
+        assert title_scores(title_id) == (14, 2, {5: 1, 9: 1}), (
+            'Проверьте, что изменение оценки в админке пересчитывает '
+            'рейтинг произведения.'
+        )
+        site._registry[Comment].delete_model(
+            None, Comment.objects.get(pk=comments[1]['id'])
+        )
+        assert Review.objects.get(pk=reviews[0]['id']).comment_count == 1
+        review_admin.delete_queryset(
+            None, Review.objects.filter(pk=reviews[0]['id'])
+        )
+        assert title_scores(title_id) == (9, 1, {9: 1})
+        assert user_counters(admin, user) == {
+            admin.username: (0, 0), user.username: (1, 0)
+        }, (
+            'Проверьте, что удаление в админке уменьшает счётчики авторов.'
+        )
+
+    def test_05_model_delete(self, admin_client, admin, user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        User.objects.get(pk=user.pk).delete()
+        assert title_scores(title.pk) == (5, 1, {5: 1}), (
+            'Проверьте, что удаление пользователя вычитает его оценки '
+            'из рейтингов произведений.'
+        )
+        assert Review.objects.get(pk=reviews[0]['id']).comment_count == 1
+        title.delete()
+        assert user_counters(admin) == {admin.username: (0, 0)}, (
+            'Проверьте, что удаление произведения уменьшает счётчики '
+            'авторов его отзывов и комментариев.'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from api.authentication import user_cache
+from reviews.models import User
+
+
+def user_selects(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30UserCache:
+    URL = '/api/v1/categories/'
+
+    def test_01_cached_lookup(self, user_client, user):
+        assert len(user_selects(user_client, self.URL)) == 1
+        assert user_selects(user_client, self.URL) == [], (
+            'Проверьте, что повторный запрос с JWT не читает пользователя '
+            'из базы.'
+        )
+        assert user_cache.get(user.pk).username == user.username
+
+    def test_02_role_change(self, admin_client, user_client, user):
+        url = '/api/v1/users/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            f'{url}{user.username}/', {'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что смена роли сбрасывает пользователя из кэша.'
+        )
+
+    def test_03_deleted_user(self, admin_client, user_client, user):
+        assert user_client.get(self.URL).status_code == HTTPStatus.OK
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert user_client.get(self.URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что удалённый пользователь не остаётся в кэше.'
+
+    def test_04_limits(self, admin_client, admin, user_client, user,
+                       settings):
+        settings.AUTH_USER_CACHE_SIZE = 1
+        user_client.get(self.URL)
+        admin_client.get(self.URL)
+        assert user_cache.get(user.pk) is None, (
+            'Проверьте, что размер кэша пользователей ограничен.'
+        )
+        assert user_cache.get(admin.pk) is not None
+        settings.AUTH_USER_CACHE_TIMEOUT = 0
+        user_client.get(self.URL)
+        assert user_cache.get(user.pk) is None, (
+            'Проверьте, что записи кэша пользователей устаревают.'
+        )
+
+    def test_05_me_reads_fresh_row(self, user_client, user):
+        user_client.get(self.URL)
+        User.objects.filter(pk=user.pk).update(bio='Новое')
+        response = user_client.patch('/api/v1/users/me/', {'first_name': 'A'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == 'Новое', (
+            'Проверьте, что `/users/me/` не сохраняет пользователя из кэша.'
+        )
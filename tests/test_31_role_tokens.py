@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from api.tokens import RoleRefreshToken
+from tests.utils import create_titles
+
+
+def role_client(user):
+    client = APIClient()
+    access = RoleRefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return client
+
+
+def user_selects(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31RoleTokens:
+    URL = '/api/v1/categories/'
+
+    def test_01_token_claims(self, client, moderator):
+        response = client.post('/api/v1/auth/token/', {
+            'username': moderator.username,
+            'confirmation_code': default_token_generator.make_token(
+                moderator
+            ),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['access'])
+        assert (token['role'], token['is_superuser']) == (
+            moderator.MODERATOR, False
+        ), 'Проверьте, что access-токен содержит роль пользователя.'
+        assert token['token_version'] == 0
+
+    def test_02_permissions_without_user_query(self, admin, user):
+        admin_client = role_client(admin)
+        admin_client.post(self.URL, {'name': 'Фильм', 'slug': 'films'})
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.URL, {'name': 'Книги', 'slug': 'books'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert user_selects(context) == [], (
+            'Проверьте, что права по токену с ролью проверяются '
+            'без чтения пользователя из базы.'
+        )
+        response = role_client(user).post(
+            self.URL, {'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_demotion_revokes_tokens(self, admin, user_superuser_client):
+        admin_client = role_client(admin)
+        url = f'/api/v1/users/{admin.username}/'
+        assert admin_client.get(url).status_code == HTTPStatus.OK
+        response = user_superuser_client.patch(url, {'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение профиля не отзывает токены.'
+        )
+        response = user_superuser_client.patch(url, {'role': 'user'})
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает выданные токены.'
+        admin.refresh_from_db()
+        response = role_client(admin).get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_writes_with_token_user(self, admin_client, user,
+                                       user_superuser_client):
+        titles, _, _ = create_titles(admin_client)
+        client = role_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        response = client.post(f'{review_url}comments/', {'text': 'Ответ'})
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.patch(review_url, {'score': 3})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном с ролью может менять свой отзыв.'
+        )
+        response = user_superuser_client.delete(
+            f'/api/v1/users/{user.username}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токены удалённого пользователя не принимаются.'
+        )
@@ -1,5 +1,9 @@
+import re
 from http import HTTPStatus
 
+from api.query_budget import get_view_budget
+from django.urls import resolve
+
 check_name_and_slug_patterns = (
     (
         {
@@ -304,3 +308,26 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+ROUTE_KWARG = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def route_urls(prefix, lookup_value, **kwargs):
+    """URL списка и объекта для маршрута роутера."""
+    prefix = ROUTE_KWARG.sub(lambda match: str(kwargs[match[1]]), prefix)
+    list_url = f'/api/v1/{prefix}/'
+    return list_url, f'{list_url}{lookup_value}/'
+
+
+def check_query_budget(client, url, django_assert_max_num_queries):
+    """GET-запрос к url не превышает бюджет его действия."""
+    budget = get_view_budget(resolve(url).func, 'GET')
+    assert budget is not None, (
+        f'Не задан бюджет SQL-запросов для GET-запроса к `{url}`.'
+    )
+    with django_assert_max_num_queries(budget):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'GET-запрос к `{url}` должен возвращать ответ со статусом 200.'
+    )